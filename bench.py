@@ -0,0 +1,40 @@
+import argparse
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src.bench import (activity, camera, chat, chunks, collisions, enemies, flow_field, format_text, game_loop,
+                       map_render, nameplates, slimes, spatial_index, terrain, text, tile_collisions)
+
+BENCHMARKS = {
+    "activity": activity.run,
+    "camera": camera.run,
+    "chat": chat.run,
+    "chunks": chunks.run,
+    "collisions": collisions.run,
+    "enemies": enemies.run,
+    "flow_field": flow_field.run,
+    "format_text": format_text.run,
+    "game": game_loop.run,
+    "map_render": map_render.run,
+    "nameplates": nameplates.run,
+    "slimes": slimes.run,
+    "spatial_index": spatial_index.run,
+    "terrain": terrain.run,
+    "text": text.run,
+    "tile_collisions": tile_collisions.run,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless benchmarks of ArcadiaTales.")
+    parser.add_argument("benchmark", choices=BENCHMARKS.keys())
+    parser.add_argument("--scenario", action="append", choices=game_loop.SCENARIOS.keys(),
+                        help="scenario of the game benchmark, can be repeated (all of them by default)")
+    parser.add_argument("--frames", type=int, default=game_loop.FRAMES, help="frames of each game scenario")
+    parser.add_argument("--output", metavar="PATH", help="file where the game benchmark writes its JSON report")
+    args = parser.parse_args()
+    if args.benchmark == "game":
+        game_loop.run(args.scenario, args.frames, args.output)
+    else:
+        BENCHMARKS[args.benchmark]()
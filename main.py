@@ -1,13 +1,37 @@
+import argparse
+import os
 import sys
+from time import perf_counter
 
 import pygame
 
+from src.config.game_data import GameData
 from src.game import Game
+from src.utils.replay import InputReplay
 
 if __name__ == "__main__":
     # Function main
+    parser = argparse.ArgumentParser(description="ArcadiaTales")
+    parser.add_argument("--record", metavar="PATH", help="record the input of every simulation tick to a file")
+    parser.add_argument("--replay", metavar="PATH", help="play a recorded input back headlessly, as fast as possible")
+    args = parser.parse_args()
+
+    config = GameData()
+    if args.record:
+        config.input_recording_path = args.record
+    if args.replay:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        config.chunk_workers = 0  # Chunks are generated when needed, as while recording
+
     pygame.init()
     game = Game()
-    game.run()
+    if args.replay:
+        start = perf_counter()
+        ticks = InputReplay(game, args.replay).run()
+        print(f"Replayed {ticks} ticks in {perf_counter() - start:.2f} s, player at {game.level.player.pos}")
+        game.quit_game()
+    else:
+        game.run()
     pygame.quit()
     sys.exit()
@@ -0,0 +1,43 @@
+import random
+from time import perf_counter
+
+import pygame
+
+from src.config.game_data import GameData
+from src.game import Game
+
+SLIME_COUNTS = (1000, 5000, 20000)
+WORLD_SIZE = 1000  # Side of the area where the slimes are spread ( in tiles )
+TICKS = 20
+DT = 1 / 60
+
+
+def measure(entity_manager):
+    """Returns the mean time (in ms) of updating the entities, after a first tick loading the chunks around them."""
+    entity_manager.update(DT)
+    start = perf_counter()
+    for _ in range(TICKS):
+        entity_manager.update(DT)
+    return (perf_counter() - start) / TICKS * 1000
+
+
+def run():
+    """Compares the entities update time with and without activity tiers, as the world population grows."""
+    pygame.init()
+    config = GameData()
+    config.chunk_workers = 0
+    game = Game()
+    entity_manager = game.level.entity_manager
+    rng = random.Random(0)
+
+    print(f"{'slimes':>7} {'every slime (ms)':>17} {'activity tiers (ms)':>20}")
+    for count in SLIME_COUNTS:
+        while len(entity_manager.enemies) < count:
+            entity_manager.spawn_entity("slime", (rng.uniform(-WORLD_SIZE / 2, WORLD_SIZE / 2),
+                                                  rng.uniform(-WORLD_SIZE / 2, WORLD_SIZE / 2)))
+        config.enemy_activity_tiers = False
+        every_slime = measure(entity_manager)
+        config.enemy_activity_tiers = True
+        activity_tiers = measure(entity_manager)
+        print(f"{count:>7} {every_slime:>17.2f} {activity_tiers:>20.2f}")
+    pygame.quit()
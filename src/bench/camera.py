@@ -0,0 +1,45 @@
+import random
+from time import perf_counter
+
+import pygame
+
+from src.config.game_data import GameData
+from src.game import Game
+
+SLIME_COUNT = 5000
+WORLD_SIZE = 500  # Side of the area where the slimes are spread ( in tiles )
+FRAMES = 100
+
+
+def measure(level):
+    """Returns the mean time (in ms) of drawing the sprites while the player walks."""
+    start = perf_counter()
+    for _ in range(FRAMES):
+        level.player.pos += (3, 2)
+        level.all_sprites.shifted_draw(level.player)
+    return (perf_counter() - start) / FRAMES * 1000
+
+
+def run():
+    """Compares the sprites drawing time with and without culling, with slimes spread over a large map."""
+    pygame.init()
+    config = GameData()
+    config.chunk_workers = 0
+    game = Game()
+    level = game.level
+    rng = random.Random(0)
+    for _ in range(SLIME_COUNT):
+        level.entity_manager.spawn_entity("slime", (rng.randrange(-WORLD_SIZE // 2, WORLD_SIZE // 2),
+                                                    rng.randrange(-WORLD_SIZE // 2, WORLD_SIZE // 2)))
+    start_pos = level.player.pos.copy()
+
+    spatial_index = level.all_sprites.spatial_index
+    level.all_sprites.spatial_index = None
+    every_sprite = measure(level)
+    level.player.pos = start_pos
+    level.all_sprites.spatial_index = spatial_index
+    culled = measure(level)
+
+    print(f"{len(level.all_sprites)} sprites, {len(level.all_sprites.sorted_sprites)} visible in the last frame")
+    print(f"every sprite: {every_sprite:.2f} ms/frame, culled: {culled:.2f} ms/frame")
+    pygame.quit()
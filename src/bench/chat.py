@@ -0,0 +1,102 @@
+from time import perf_counter
+
+import pygame
+
+from src.config.game_data import GameData
+from src.game import Game
+
+SHOWN_MESSAGES = (5, 20, 100)
+KEYSTROKES = 200
+FLOOD_MESSAGES = 100_000
+FLOOD_FRAMES = 60  # Frames drawn while flooding, as during one second of play
+FLOOD_LIMITS = (100, 10_000)  # Messages kept in the chat
+COMPLETED_TEXTS = ("/", "/g", "/game ", "/game su", "/game summon sl", "/debug profile st", "/dbg")
+COMPLETION_ROUNDS = 2000
+
+
+def type_text(chat_ui, cached):
+    """Returns the mean time (in ms) of typing a character and drawing the chat."""
+    key_event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a")
+    backspace_event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_BACKSPACE, unicode="")
+    start = perf_counter()
+    for index in range(KEYSTROKES):
+        chat_ui.handle_event(key_event if index % 20 < 10 else backspace_event)
+        if not cached:  # Render every message on each keystroke, as before the cache
+            chat_ui.message_surfaces.clear()
+            chat_ui.shown_state = None
+            chat_ui.update_chat_surfaces()
+        chat_ui.draw()
+    return (perf_counter() - start) / KEYSTROKES * 1000
+
+
+def flood_list(limit):
+    """Returns the time (in s) of adding the flood messages to a list trimmed from its start, as before the deque."""
+    messages = []
+    start = perf_counter()
+    for index in range(FLOOD_MESSAGES):
+        messages.append(f"&7Flood message {index}")
+        while len(messages) > limit:
+            messages.pop(0)
+    return perf_counter() - start
+
+
+def flood(game, limit, frames):
+    """Returns the time (in s) of showing the flood messages, drawing the chat the given number of times meanwhile."""
+    game.config.Chat.max_messages = limit
+    messages_per_frame = FLOOD_MESSAGES // frames if frames else FLOOD_MESSAGES + 1
+    start = perf_counter()
+    for index in range(FLOOD_MESSAGES):
+        game.chat.show_message(f"&7Flood message {index}")
+        if index % messages_per_frame == 0:
+            game.chat_ui.draw()
+    return perf_counter() - start
+
+
+def complete_reference(chat, text):
+    """Chat.complete before the command tries, walking a copy of the whole command tree."""
+    if not chat.is_command(text):
+        return ()
+    current_text = chat.remove_prefix(text)
+    leaf = chat.tree.copy()
+    while " " in current_text:
+        word, current_text = current_text.split(" ", 1)
+        if word not in leaf:
+            break
+        leaf = leaf[word]
+    return set(filter(lambda x: x.startswith(current_text), leaf))
+
+
+def measure_completion(complete):
+    """Returns the mean time (in us) of completing a text."""
+    start = perf_counter()
+    for _ in range(COMPLETION_ROUNDS):
+        for text in COMPLETED_TEXTS:
+            complete(text)
+    return (perf_counter() - start) / (COMPLETION_ROUNDS * len(COMPLETED_TEXTS)) * 1e6
+
+
+def run():
+    """Measures typing with and without the messages surfaces cache, flooding the chat and completing commands."""
+    pygame.init()
+    config = GameData()
+    config.chunk_workers = 0
+    game = Game()
+    config.Chat.chat_open = True
+    for shown_messages in SHOWN_MESSAGES:
+        config.Chat.max_shown_messages = shown_messages
+        config.Chat.max_messages = shown_messages
+        for index in range(shown_messages):
+            game.chat.show_message(f"&7Message &b{index} &7of the &ahistory")
+        print(f"{shown_messages:>4} messages shown: rendered every keystroke: "
+              f"{type_text(game.chat_ui, cached=False):.3f} ms, cached: {type_text(game.chat_ui, cached=True):.3f} ms")
+
+    config.Chat.max_shown_messages = 20
+    for limit in FLOOD_LIMITS:
+        print(f"{FLOOD_MESSAGES} messages, {limit} kept: list: {FLOOD_MESSAGES / flood_list(limit):,.0f} messages/s, "
+              f"chat: {FLOOD_MESSAGES / flood(game, limit, 0):,.0f} messages/s, "
+              f"chat drawn {FLOOD_FRAMES} times: {FLOOD_MESSAGES / flood(game, limit, FLOOD_FRAMES):,.0f} messages/s")
+
+    commands = game.chat.commands
+    print(f"completion: tree: {measure_completion(lambda text: complete_reference(commands, text)):.2f} us, "
+          f"trie: {measure_completion(commands.complete):.2f} us")
+    pygame.quit()
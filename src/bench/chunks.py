@@ -0,0 +1,42 @@
+from time import perf_counter
+
+import numpy as np
+
+from src.config.game_data import GameData
+from src.map.chunk_manager import ChunkManager
+from src.map.tile_map import NoiseTileMapGenerator
+
+WORKERS = (0, 1, 2, 4)
+CHUNKS_SIDE = 16
+
+
+def generate_chunks(chunk_manager, keys):
+    for chunk_x, chunk_y in keys:
+        chunk_manager.get_chunk(chunk_x, chunk_y)
+    return [chunk_manager.get_chunk(chunk_x, chunk_y, wait=True) for chunk_x, chunk_y in keys]
+
+
+def run():
+    """Measures the chunk generation speed for several worker counts, checking they all generate the same chunks."""
+    config = GameData()
+    keys = [(chunk_x, chunk_y) for chunk_y in range(-CHUNKS_SIDE // 2, CHUNKS_SIDE // 2)
+            for chunk_x in range(-CHUNKS_SIDE // 2, CHUNKS_SIDE // 2)]
+    config.chunk_cache_memory = 2 * len(keys) * 2 * config.chunk_size * config.chunk_size
+    generator = NoiseTileMapGenerator(None)
+    serial_chunks = None
+
+    print(f"{'workers':>8} {'seconds':>10} {'chunks/s':>10} {'same as serial':>15}")
+    for workers in WORKERS:
+        config.chunk_workers = workers
+        chunk_manager = ChunkManager(generator)
+        start = perf_counter()
+        chunks = generate_chunks(chunk_manager, keys)
+        elapsed = perf_counter() - start
+        chunk_manager.close()
+
+        if serial_chunks is None:
+            serial_chunks = chunks
+        same = all(np.array_equal(chunk.tile_ids, serial_chunk.tile_ids)
+                   and np.array_equal(chunk.variants, serial_chunk.variants)
+                   for chunk, serial_chunk in zip(chunks, serial_chunks))
+        print(f"{workers:>8} {elapsed:>10.3f} {len(keys) / elapsed:>10,.0f} {str(same):>15}")
@@ -0,0 +1,101 @@
+import random
+from time import perf_counter
+
+import pygame
+
+from src.config.game_data import GameData
+from src.entities.enemies.slime import Slime
+from src.game import Game
+
+CROWDS = ((1000, 20), (1000, 60))  # (slimes, side of the area where they are crowded in tiles)
+TICKS = 20
+
+
+def push_apart(entity1, entity2):
+    """Entity collision of a slime pair, as resolved before the collision stage."""
+    if isinstance(entity1, Slime) and isinstance(entity2, Slime):
+        dx = entity1.pos.x - entity2.pos.x
+        dy = entity1.pos.y - entity2.pos.y
+        distance_squared = dx * dx + dy * dy
+        min_distance_squared = (entity1.width / 2 + entity2.width / 2) ** 2
+
+        if distance_squared < min_distance_squared:
+            distance = distance_squared ** 0.5
+            if distance != 0:
+                overlap = (entity1.width / 2 + entity2.width / 2) - distance
+                if overlap > 0:
+                    overlap_dx = (dx / distance) * overlap
+                    overlap_dy = (dy / distance) * overlap
+                    entity1.pos.x += overlap_dx
+                    entity1.pos.y += overlap_dy
+                    entity2.pos.x -= overlap_dx
+                    entity2.pos.y -= overlap_dy
+
+
+def check_collisions_per_entity(entity_manager):
+    """Every entity queries its neighbours and resolves its collisions on its own, as before."""
+    for entity in [entity_manager.player] + entity_manager.enemies:
+        for other_entity in entity_manager.spatial_hash.query(entity.collide_rect):
+            if other_entity != entity and entity.collide_rect.colliderect(other_entity.collide_rect):
+                push_apart(entity, other_entity)
+
+
+def place(entity_manager, positions):
+    for enemy, pos in zip(entity_manager.enemies, positions):
+        enemy.pos.update(pos)
+        enemy.collide_rect = enemy.get_collide_rect()
+        entity_manager.spatial_hash.update(enemy, enemy.collide_rect)
+
+
+def measure(entity_manager, check_collisions, positions):
+    """Returns the mean time (in ms) of resolving the collisions of the crowd, and the positions it ends at."""
+    elapsed = 0
+    for _ in range(TICKS):
+        place(entity_manager, positions)
+        start = perf_counter()
+        check_collisions()
+        elapsed += perf_counter() - start
+    return elapsed / TICKS * 1000, [enemy.pos.copy() for enemy in entity_manager.enemies]
+
+
+def spawn_crowd(entity_manager, slime_count, crowd_size, seed=0):
+    """Replaces the enemies with slimes spread at random over a square of crowd_size tiles next to the player."""
+    for enemy in list(entity_manager.enemies):
+        entity_manager.remove_entity(enemy)
+    rng = random.Random(seed)
+    origin = entity_manager.player.pos / entity_manager.config.tile_size
+    for _ in range(slime_count):
+        entity_manager.spawn_entity("slime", (origin.x + rng.uniform(0, crowd_size),
+                                              origin.y + rng.uniform(0, crowd_size)))
+    return [enemy.pos.copy() for enemy in entity_manager.enemies]
+
+
+def get_mean_distance(positions, other_positions):
+    return sum((pos - other_pos).length() for pos, other_pos in zip(positions, other_positions)) / len(positions)
+
+
+def run():
+    """Compares the per-entity collision checks with the broad/narrow-phase stage on crowds of slimes."""
+    pygame.init()
+    config = GameData()
+    config.chunk_workers = 0
+    game = Game()
+    entity_manager = game.level.entity_manager
+
+    print(f"{'slimes':>7} {'area (tiles)':>13} {'colliding pairs':>16} {'per entity (ms)':>16} {'stage (ms)':>11}"
+          f" {'moved per entity (px)':>22} {'moved stage (px)':>17} {'mean deviation (px)':>20}")
+    for slime_count, crowd_size in CROWDS:
+        positions = spawn_crowd(entity_manager, slime_count, crowd_size)
+        place(entity_manager, positions)
+        pairs = len(entity_manager.spatial_hash.get_overlapping_pairs())
+        per_entity, per_entity_positions = measure(entity_manager,
+                                                   lambda: check_collisions_per_entity(entity_manager), positions)
+        stage, stage_positions = measure(entity_manager, entity_manager.check_collisions, positions)
+
+        # The stage averages the pushes of a tick instead of applying them one after another, so the slimes in
+        # a crowd end close by, those touching a single other slime where they ended before
+        print(f"{slime_count:>7} {f'{crowd_size} x {crowd_size}':>13} {pairs:>16} {per_entity:>16.2f} {stage:>11.2f}"
+              f" {get_mean_distance(per_entity_positions, positions):>22.2f}"
+              f" {get_mean_distance(stage_positions, positions):>17.2f}"
+              f" {get_mean_distance(stage_positions, per_entity_positions):>20.2f}")
+    pygame.quit()
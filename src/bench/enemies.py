@@ -0,0 +1,71 @@
+import random
+from time import perf_counter
+
+import pygame
+from pygame import Vector2
+from pygame.sprite import Group
+
+from src.entities.enemies.slime import Slime
+from src.entities.enemies.slime_swarm import SlimeSwarm
+
+SLIME_COUNTS = (1000, 10000)
+AREA_SIZE = 30  # Side of the area where the slimes are spread around their target ( in tiles )
+TICKS = 30
+DT = 1 / 60
+
+
+class MockTarget:
+    def __init__(self):
+        self.pos = Vector2()
+
+
+def spawn_slimes(count, target):
+    rng = random.Random(0)
+    group = Group()
+    slimes = []
+    for _ in range(count):
+        slime = Slime(group=group, pos=(rng.uniform(-AREA_SIZE / 2, AREA_SIZE / 2),
+                                        rng.uniform(-AREA_SIZE / 2, AREA_SIZE / 2)))
+        slime.target = target
+        slimes.append(slime)
+    return slimes
+
+
+def measure(update, target):
+    """Returns the mean time (in ms) of a tick while the target walks around."""
+    rng = random.Random(1)
+    elapsed = 0
+    for _ in range(TICKS):
+        target.pos += (rng.uniform(-20, 20), rng.uniform(-20, 20))
+        start = perf_counter()
+        update()
+        elapsed += perf_counter() - start
+    return elapsed / TICKS * 1000
+
+
+def run():
+    """Compares updating every slime sprite with the NumPy slime swarm, and checks both end in the same state."""
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    print(f"{'slimes':>7} {'sprites (ms)':>13} {'swarm (ms)':>11} {'identical':>10}")
+    for count in SLIME_COUNTS:
+        target = MockTarget()
+        sprites = spawn_slimes(count, target)
+
+        def update_sprites():
+            for slime in sprites:
+                slime.update(DT)
+
+        sprites_time = measure(update_sprites, target)
+
+        target = MockTarget()
+        swarm = SlimeSwarm()
+        for slime in spawn_slimes(count, target):
+            swarm.add(slime)
+        swarm_time = measure(lambda: swarm.update(DT), target)
+
+        identical = all(slime.pos == other.pos and slime.image is other.image
+                        for slime, other in zip(sprites, swarm.slimes))
+        print(f"{count:>7} {sprites_time:>13.2f} {swarm_time:>11.2f} {str(identical):>10}")
+    pygame.quit()
@@ -0,0 +1,52 @@
+import random
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+from src.config.game_data import GameData
+from src.game import Game
+from src.map.flow_field import FlowField
+
+RADII = (8, 12, 24)
+ENEMY_COUNTS = (100, 1000, 10000)
+REPEATS = 20
+
+
+def run():
+    """Times computing the flow field for several radii, then reading it for more and more enemies."""
+    pygame.init()
+    config = GameData()
+    config.chunk_workers = 0
+    game = Game()
+    level = game.level
+    player_pos = level.player.pos
+
+    print(f"{'radius':>7} {'walkable tiles':>15} {'compute (ms)':>13}")
+    for radius in RADII:
+        flow_field = FlowField(level.tiles_map, radius)
+        start = perf_counter()
+        for _ in range(REPEATS):
+            flow_field.key = None
+            flow_field.update(player_pos)
+        elapsed = (perf_counter() - start) / REPEATS * 1000
+        walkable = int(flow_field.has_path.sum()) + 1
+        print(f"{radius:>7} {walkable:>15} {elapsed:>13.2f}")
+
+    flow_field = level.entity_manager.flow_field
+    flow_field.update(player_pos)
+    rng = random.Random(0)
+    area = flow_field.radius * config.tile_size
+    print(f"\n{'enemies':>8} {'one by one (ms)':>16} {'array (ms)':>11}")
+    for count in ENEMY_COUNTS:
+        positions = [player_pos + (rng.uniform(-area, area), rng.uniform(-area, area)) for _ in range(count)]
+        start = perf_counter()
+        for pos in positions:
+            flow_field.get_direction(pos)
+        one_by_one = (perf_counter() - start) * 1000
+        positions_array = np.array([(pos.x, pos.y) for pos in positions])
+        start = perf_counter()
+        flow_field.get_directions(positions_array)
+        array = (perf_counter() - start) * 1000
+        print(f"{count:>8} {one_by_one:>16.2f} {array:>11.2f}")
+    pygame.quit()
@@ -0,0 +1,71 @@
+import random
+from time import perf_counter
+
+from src.utils.colors import colors
+from src.utils.utils import format_text, parse_color_codes
+
+CHARACTERS = "&&&07aefgz x"  # Biased towards color codes
+RANDOM_LINES = 10_000
+ROUNDS = 20
+
+
+def format_text_reference(line):
+    """format_text before the regex parser, walking the line one character at a time."""
+    formatted_lines = []
+    current_color = (255, 255, 255)
+    current_text = ""
+    index = 0
+    line_length = len(line)
+    while index < line_length:
+        if line[index] == "&" and index + 1 < line_length and line[index + 1] in "0123456789ABCDEFabcdef":
+            color_char = line[index + 1]
+            try:
+                color_index = int(color_char, 16)
+                if 0 <= color_index < len(colors):
+                    if current_text:
+                        formatted_lines.append((current_text, current_color))
+                        current_text = ""
+                    current_color = colors[color_char]
+                index += 2
+            except ValueError:
+                current_text += line[index]
+                index += 1
+        else:
+            current_text += line[index]
+            index += 1
+    if current_text:
+        formatted_lines.append((current_text, current_color))
+    return formatted_lines
+
+
+def get_lines():
+    """Lines shown by the game and random lines, without && whose meaning changed."""
+    rng = random.Random(0)
+    lines = ["&eChiroYuki", "&cSlimey", "&bWelcome &7to the chat system!", "&7Use &bt &7to open the Chat",
+             "&c Error: This command does not exist : foo.", "Loading summon...", "", "&", "&f", "a&", "&g&7&"]
+    while len(lines) < RANDOM_LINES:
+        line = "".join(rng.choice(CHARACTERS) for _ in range(rng.randint(0, 40)))
+        if "&&" not in line:
+            lines.append(line)
+    return lines
+
+
+def measure(function, lines):
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        for line in lines:
+            function(line)
+    return (perf_counter() - start) / (ROUNDS * len(lines)) * 1e6
+
+
+def run():
+    """Checks that format_text parses as before and compares the time per line of both parsers."""
+    lines = get_lines()
+    mismatches = [line for line in lines if format_text(line) != format_text_reference(line)]
+    print(f"{len(lines)} lines, {len(mismatches)} parsed differently")
+    print(f"reference: {measure(format_text_reference, lines):.2f} us/line")
+    parse_color_codes.cache_clear()
+    print(f"regex, all cache misses: {measure(lambda line: parse_color_codes.__wrapped__(line), lines):.2f} us/line")
+    chat_lines = lines[:20]  # The lines shown by the chat, parsed again and again
+    print(f"cached, chat lines: {measure(format_text, chat_lines):.2f} us/line "
+          f"(reference: {measure(format_text_reference, chat_lines):.2f} us/line)")
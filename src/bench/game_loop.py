@@ -0,0 +1,173 @@
+import json
+import random
+from collections import defaultdict
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+from src.config.game_data import GameData
+from src.entities.player import MOVEMENT_KEYS
+from src.game import Game
+from src.utils.replay import RecordedKeys
+
+FRAMES = 300
+DT = 1 / 60  # Every frame runs one simulation tick of this duration
+SLIMES_AREA = 60  # Side of the area around the player where the slimes are spawned ( in tiles )
+CHAT_MESSAGE = "hello world"
+WINDOW_SIZES = ((1280, 720), (1600, 900), (960, 540))
+PERCENTILES = (50, 95, 99)
+
+
+class Scenario:
+    """Scripted input of a benchmarked run: setup prepares the game, before_frame posts the input of a frame."""
+
+    name: str
+
+    def setup(self, game):
+        pass
+
+    def before_frame(self, game, frame):
+        pass
+
+
+class Idle(Scenario):
+    name = "idle"
+
+
+class Walking(Scenario):
+    name = "walking"
+
+    def setup(self, game):
+        self.rng = random.Random(0)
+        self.keys = RecordedKeys([])
+        game.level.player.get_pressed = lambda: self.keys
+
+    def before_frame(self, game, frame):
+        if frame % 60 == 0:
+            self.keys = RecordedKeys(self.rng.sample(MOVEMENT_KEYS, 2))
+
+
+class Slimes(Scenario):
+    def __init__(self, count):
+        self.count = count
+        self.name = f"slimes_{count // 1000}k"
+
+    def setup(self, game):
+        rng = random.Random(0)
+        center = game.level.player.pos / game.config.tile_size
+        entity_manager = game.level.entity_manager
+        for _ in range(self.count):
+            entity_manager.spawn_entity("slime", (center.x + rng.uniform(-SLIMES_AREA / 2, SLIMES_AREA / 2),
+                                                  center.y + rng.uniform(-SLIMES_AREA / 2, SLIMES_AREA / 2)))
+
+
+class ChatSpam(Scenario):
+    name = "chat_spam"
+
+    def before_frame(self, game, frame):
+        # Opens the chat, types a message and sends it, every frame
+        post_key(pygame.K_t, "t")
+        for character in CHAT_MESSAGE:
+            post_key(0, character)
+        post_key(pygame.K_RETURN, "\r")
+
+
+class InventoryOpen(Scenario):
+    name = "inventory_open"
+
+    def setup(self, game):
+        game.config.show_player_inventory = True
+
+
+class Resize(Scenario):
+    name = "resize"
+
+    def before_frame(self, game, frame):
+        if frame % 30 == 0:
+            width, height = WINDOW_SIZES[frame // 30 % len(WINDOW_SIZES)]
+            pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, size=(width, height), w=width, h=height))
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (Idle(), Walking(), Slimes(1000), Slimes(10000), ChatSpam(),
+                                                      InventoryOpen(), Resize())}
+
+
+def post_key(key, unicode):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0, scancode=0))
+
+
+def time_phase(timings, phase, function):
+    """Returns function, adding the time spent in it to timings[phase]."""
+    def timed_function(*args, **kwargs):
+        start = perf_counter()
+        result = function(*args, **kwargs)
+        timings[phase] += perf_counter() - start
+        return result
+    return timed_function
+
+
+def run_scenario(scenario, frames):
+    """Runs the game for frames frames and returns the time (in ms) of each phase in each frame."""
+    game = Game()
+    scenario.setup(game)
+    timings = defaultdict(float)
+    game.handle_events = time_phase(timings, "handle_events", game.handle_events)
+    game.level.load_chunks = time_phase(timings, "Level.load_chunks", game.level.load_chunks)
+    game.level.update = time_phase(timings, "Level.update", game.level.update)
+    game.level.map_render.draw_map = time_phase(timings, "MapRender.draw_map", game.level.map_render.draw_map)
+    game.level.all_sprites.shifted_draw = time_phase(timings, "Camera.shifted_draw",
+                                                     game.level.all_sprites.shifted_draw)
+    game.chat_ui.draw = time_phase(timings, "ChatUI.draw", game.chat_ui.draw)
+    game.overlay.draw = time_phase(timings, "Overlay.draw", game.overlay.draw)
+
+    phases = defaultdict(list)
+    for frame in range(frames):
+        scenario.before_frame(game, frame)
+        timings.clear()
+        start = perf_counter()
+        game.handle_events()
+        game.level.load_chunks()
+        game.step(DT)
+        game.overlay.update_texts()
+        game.render()
+        phases["frame"].append((perf_counter() - start) * 1000)
+        for phase, elapsed in timings.items():
+            phases[phase].append(elapsed * 1000)
+    game.quit_game()
+    return phases
+
+
+def summarize(times, frames):
+    # Phases that did not run in a frame took no time in it
+    times = np.array(times + [0] * (frames - len(times)))
+    summary = {"mean": round(float(times.mean()), 3)}
+    for percentile in PERCENTILES:
+        summary[f"p{percentile}"] = round(float(np.percentile(times, percentile)), 3)
+    return summary
+
+
+def run(scenarios=None, frames=FRAMES, output=None):
+    """Runs the whole game loop headlessly on scripted scenarios and reports the time of each phase as JSON."""
+    pygame.init()
+    config = GameData()
+    saved_config = dict(vars(config))
+    saved_chat_open = config.Chat.chat_open
+    results = {}
+    for name in scenarios or SCENARIOS:
+        config.chunk_workers = 0  # Chunks are generated when needed, so that every run does the same work
+        phases = run_scenario(SCENARIOS[name], frames)
+        results[name] = {"frames": frames, "phases": {phase: summarize(times, frames)
+                                                      for phase, times in phases.items()}}
+        # Scenarios change the configuration (window size, chat and inventory opened)
+        vars(config).clear()
+        vars(config).update(saved_config)
+        config.Chat.chat_open = saved_chat_open
+    pygame.quit()
+
+    report = json.dumps(results, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
@@ -0,0 +1,54 @@
+from time import perf_counter
+
+import pygame
+
+from src.config.game_data import GameData
+from src.game import Game
+
+WINDOW_SIZES = ((640, 360), (1280, 720), (1920, 1080), (3840, 2160))
+FRAMES = 200
+
+
+def draw_map_per_tile(level):
+    """The former renderer, blitting every visible tile every frame."""
+    config = level.config
+    start_x, start_y, tile_ids = level.tile_map_generator.get_visible_tiles()
+    for row, tile_row in enumerate(tile_ids.tolist()):
+        for column, tile_id in enumerate(tile_row):
+            if tile_id in level.map_render.tile_images:
+                tile_x = (((start_x + column) * config.tile_size + config.tile_size / 2)
+                          - level.player.pos.x + config.window_width // 2)
+                tile_y = (((start_y + row) * config.tile_size + config.tile_size / 2)
+                          - level.player.pos.y + config.window_height // 2)
+                level.display_surface.blit(level.map_render.tile_images[tile_id], (tile_x, tile_y))
+
+
+def measure(level, draw):
+    """Returns the mean frame time of draw (in ms) while the player walks diagonally."""
+    start = perf_counter()
+    for _ in range(FRAMES):
+        level.player.pos += (3, 2)
+        level.tiles_map.load_around(level.player.pos, wait=True)
+        draw()
+    return (perf_counter() - start) / FRAMES * 1000
+
+
+def run():
+    """Compares the map drawing time of the chunk renderer with per-tile blits for several window sizes."""
+    pygame.init()
+    config = GameData()
+    config.chunk_workers = 0
+    game = Game()
+    level = game.level
+
+    print(f"{'window':>10} {'per tile (ms)':>14} {'chunks (ms)':>12}")
+    for width, height in WINDOW_SIZES:
+        config.window_width, config.window_height = width, height
+        level.display_surface = pygame.display.set_mode((width, height))
+        level.map_render.load_tile_images()  # The images are converted for the new display surface
+        start_pos = level.player.pos.copy()
+        per_tile = measure(level, lambda: draw_map_per_tile(level))
+        level.player.pos = start_pos
+        chunks = measure(level, level.map_render.draw_map)
+        print(f"{f'{width}x{height}':>10} {per_tile:>14.2f} {chunks:>12.2f}")
+    pygame.quit()
@@ -0,0 +1,47 @@
+import random
+from time import perf_counter
+
+import pygame
+
+from src.config.game_data import GameData
+from src.game import Game
+from src.overlays.health_bar import HealthBar
+
+SLIME_COUNT = 200
+FRAMES = 200
+
+
+def measure(level, cached):
+    """Returns the mean time (in ms) of drawing the sprites, their health bars and names."""
+    start = perf_counter()
+    for _ in range(FRAMES):
+        if not cached:  # Render the health bars and names every frame, as before the caches
+            HealthBar.clear()
+            for sprite in level.all_sprites:
+                sprite.nameplate.clear()
+        level.all_sprites.shifted_draw(level.player)
+    return (perf_counter() - start) / FRAMES * 1000
+
+
+def run():
+    """Compares the sprites drawing time with and without cached health bars and names, with on-screen slimes."""
+    pygame.init()
+    config = GameData()
+    config.chunk_workers = 0
+    game = Game()
+    level = game.level
+    rng = random.Random(0)
+    player_x, player_y = level.tile_map_generator.get_tile_position(level.player.pos)
+    half_width = config.window_width // config.tile_size // 2
+    half_height = config.window_height // config.tile_size // 2
+    for _ in range(SLIME_COUNT):
+        level.entity_manager.spawn_entity("slime", (player_x + rng.randint(-half_width, half_width),
+                                                    player_y + rng.randint(-half_height, half_height)))
+    for enemy in level.entity_manager.enemies:
+        enemy.health = rng.randint(1, enemy.max_health)
+
+    level.all_sprites.shifted_draw(level.player)
+    print(f"{len(level.all_sprites.sorted_sprites)} sprites on screen")
+    print(f"rendered every frame: {measure(level, cached=False):.2f} ms/frame, "
+          f"cached: {measure(level, cached=True):.2f} ms/frame")
+    pygame.quit()
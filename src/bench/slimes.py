@@ -0,0 +1,48 @@
+import tracemalloc
+from time import perf_counter
+
+import pygame
+from pygame.sprite import Group
+
+from src.entities.animation_registry import AnimationRegistry
+from src.entities.enemies.slime import Slime
+
+SLIME_COUNTS = (50, 500, 5000)
+
+
+def get_frames_memory(slimes):
+    """Returns the memory used by the pixels of the distinct animation frames of the slimes."""
+    frames = {id(frame): frame for slime in slimes for animation in slime.animations.values() for frame in animation}
+    return sum(frame.get_width() * frame.get_height() * frame.get_bytesize() for frame in frames.values())
+
+
+def spawn_slimes(count, shared_assets):
+    """Returns the time (in s) and memory (in MB) taken to create count slimes."""
+    AnimationRegistry.clear()
+    group = Group()
+    tracemalloc.start()
+    start = perf_counter()
+    for index in range(count):
+        if not shared_assets:  # Every slime loads its own assets, as before the registry
+            AnimationRegistry.clear()
+        Slime(group=group, pos=(index % 100, index // 100))
+    elapsed = perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0] + get_frames_memory(group.sprites())
+    tracemalloc.stop()
+    return elapsed, memory / 1024 / 1024
+
+
+def run():
+    """Measures the startup time and memory of the slimes, with and without shared animation assets."""
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    print(f"{'slimes':>8} {'own assets (s)':>15} {'(MB)':>8} {'shared (s)':>11} {'(MB)':>8}")
+    for count in SLIME_COUNTS:
+        # Loading the assets of every slime takes minutes for the biggest counts, so it is extrapolated
+        sample = min(count, 50)
+        own_time, own_memory = spawn_slimes(sample, shared_assets=False)
+        shared_time, shared_memory = spawn_slimes(count, shared_assets=True)
+        print(f"{count:>8} {own_time * count / sample:>15.3f} {own_memory * count / sample:>8.1f}"
+              f" {shared_time:>11.3f} {shared_memory:>8.1f}")
+    pygame.quit()
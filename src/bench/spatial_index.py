@@ -0,0 +1,66 @@
+import random
+from time import perf_counter
+
+from pygame import Rect
+from pyqtree import Index
+
+from src.entities.spatial_hash import SpatialHash
+
+ENTITY_COUNTS = (100, 1000, 10000)
+WORLD_SIZE = 20000  # Side of the area where the entities move ( in pixels )
+ENTITY_SIZE = 64
+TICKS = 10
+
+
+class MockEntity:
+    def __init__(self, rng):
+        self.collide_rect = Rect(rng.randrange(WORLD_SIZE), rng.randrange(WORLD_SIZE), ENTITY_SIZE, ENTITY_SIZE)
+
+    def move(self, rng):
+        self.collide_rect.move_ip(rng.randint(-8, 8), rng.randint(-8, 8))
+
+
+def get_bbox(rect):
+    return rect.left, rect.top, rect.right, rect.bottom
+
+
+def tick_quadtree(quadtree, entities, rng):
+    for entity in entities:
+        quadtree.remove(entity, get_bbox(entity.collide_rect))
+        entity.move(rng)
+        quadtree.insert(entity, get_bbox(entity.collide_rect))
+    for entity in entities:
+        quadtree.intersect(get_bbox(entity.collide_rect))
+
+
+def tick_spatial_hash(spatial_hash, entities, rng):
+    for entity in entities:
+        entity.move(rng)
+        spatial_hash.update(entity, entity.collide_rect)
+    for entity in entities:
+        spatial_hash.query(entity.collide_rect)
+
+
+def measure(index, insert, tick, count):
+    """Returns the mean time (in ms) of a tick where every entity moves then queries its neighbours."""
+    rng = random.Random(0)
+    entities = [MockEntity(rng) for _ in range(count)]
+    for entity in entities:
+        insert(index, entity)
+    start = perf_counter()
+    for _ in range(TICKS):
+        tick(index, entities, rng)
+    return (perf_counter() - start) / TICKS * 1000
+
+
+def run():
+    """Compares the spatial hash with a pyqtree index kept up to date, for several entity counts."""
+    print(f"{'entities':>9} {'pyqtree (ms)':>13} {'spatial hash (ms)':>18}")
+    for count in ENTITY_COUNTS:
+        quadtree = measure(Index(bbox=(0, 0, WORLD_SIZE, WORLD_SIZE)),
+                           lambda index, entity: index.insert(entity, get_bbox(entity.collide_rect)),
+                           tick_quadtree, count)
+        spatial_hash = measure(SpatialHash(cell_size=128),
+                               lambda index, entity: index.insert(entity, entity.collide_rect),
+                               tick_spatial_hash, count)
+        print(f"{count:>9} {quadtree:>13.2f} {spatial_hash:>18.2f}")
@@ -0,0 +1,18 @@
+from time import perf_counter
+
+from src.map.tile_map import NoiseTileMapGenerator
+
+MAP_SIZES = (50, 256, 1024)
+
+
+def run():
+    """Measures the terrain generation speed and the tile map memory for several map sizes."""
+    print(f"{'map size':>10} {'seconds':>10} {'tiles/s':>14} {'MB/M tiles':>12}")
+    for map_size in MAP_SIZES:
+        generator = NoiseTileMapGenerator(None)
+        start = perf_counter()
+        tiles_map = generator.generate_tiles_map(0, 0, map_size, map_size)
+        elapsed = perf_counter() - start
+        tiles_count = map_size * map_size
+        memory = tiles_map.tile_ids.nbytes + tiles_map.variants.nbytes
+        print(f"{map_size:>10} {elapsed:>10.3f} {tiles_count / elapsed:>14,.0f} {memory / tiles_count:>12.2f}")
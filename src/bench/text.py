@@ -0,0 +1,52 @@
+import random
+from time import perf_counter
+
+import pygame
+import pygame.freetype
+
+from src.config.game_data import GameData
+from src.utils.colors import colors
+from src.utils.glyph_atlas import GlyphAtlas
+from src.utils.utils import draw_formatted_message, format_text
+
+FONTS = (("assets/fonts/LycheeSoda.ttf", GameData.Chat.font_size), ("assets/fonts/Bubble.ttf", 12))
+NAMES = ("Slime", "Slimey", "Gooey", "Squishy", "Blobby", "Jelly", "Squidgy", "Sloppy", "Sloshy")
+LINE_COUNT = 300  # Nameplates and chat lines drawn per frame
+FRAMES = 50
+
+
+def draw_reference(font, surface, formatted_message, pos):
+    """draw_formatted_message before the glyph atlases, rendering every segment with the font."""
+    x, y = pos
+    drawn_rect = pygame.Rect(x, y, 0, 0)
+    for text, color in formatted_message:
+        drawn_rect.union_ip(font.render_to(surface, (x, y), text, color))
+        x += font.get_rect(text)[2]
+    return drawn_rect
+
+
+def measure(draw, font, surface, lines):
+    """Returns the mean time (in ms) of drawing the lines on the surface."""
+    start = perf_counter()
+    for _ in range(FRAMES):
+        for index, formatted_message in enumerate(lines):
+            draw(font, surface, formatted_message, (index % 4 * 300, index // 4 * 8))
+    return (perf_counter() - start) / FRAMES * 1000
+
+
+def run():
+    """Compares drawing formatted texts with the fonts and with the glyph atlases."""
+    pygame.init()
+    surface = pygame.display.set_mode((1280, 720))
+    rng = random.Random(0)
+    codes = "".join(colors)
+    lines = [format_text(f"&{rng.choice(codes)}{rng.choice(NAMES)} &{rng.choice(codes)}{rng.randint(0, 999)}")
+             for _ in range(LINE_COUNT // 2)]
+    lines += [format_text(f"&7Message &b{index} &7of the &ahistory") for index in range(LINE_COUNT // 2)]
+    for path, size in FONTS:
+        font = pygame.freetype.Font(path, size)
+        GlyphAtlas.clear()
+        draw_formatted_message(font, surface, format_text(codes), (0, 0))  # Fill the atlases once
+        print(f"{path} {size}: font: {measure(draw_reference, font, surface, lines):.2f} ms/frame, "
+              f"atlas: {measure(draw_formatted_message, font, surface, lines):.2f} ms/frame")
+    pygame.quit()
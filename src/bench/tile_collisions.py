@@ -0,0 +1,57 @@
+import random
+from time import perf_counter
+
+import pygame
+
+from src.config.game_data import GameData
+from src.game import Game
+
+SLIME_COUNTS = (100, 1000, 10000)
+TICKS = 10
+
+
+def place(enemies, positions):
+    for enemy, pos in zip(enemies, positions):
+        enemy.pos.update(pos)
+        enemy.collide_rect = enemy.get_collide_rect()
+
+
+def measure(enemies, check_tile_collisions, positions):
+    """Returns the mean time (in ms) of resolving the tile collisions of the enemies, and where they end."""
+    elapsed = 0
+    for _ in range(TICKS):
+        place(enemies, positions)
+        start = perf_counter()
+        check_tile_collisions(enemies)
+        elapsed += perf_counter() - start
+    return elapsed / TICKS * 1000, [enemy.pos.copy() for enemy in enemies]
+
+
+def run():
+    """Compares the scalar tile collisions with the batched ones, and checks they push the slimes identically."""
+    pygame.init()
+    config = GameData()
+    config.chunk_workers = 0
+    game = Game()
+    entity_manager = game.level.entity_manager
+    start_x, start_y, end_x, end_y = entity_manager.tile_map_generator.get_world_bounds()
+
+    def check_tile_collisions_one_by_one(enemies):
+        for enemy in enemies:
+            entity_manager.check_tile_collision(enemy)
+
+    print(f"{'slimes':>7} {'scalar (ms)':>12} {'batched (ms)':>13} {'identical':>10}")
+    rng = random.Random(0)
+    for count in SLIME_COUNTS:
+        while len(entity_manager.enemies) < count:
+            entity_manager.spawn_entity("slime", (0, 0))
+        enemies = entity_manager.enemies[:count]
+        # Anywhere in the spawn area, walls and map borders included
+        positions = [(rng.uniform(start_x, end_x) * config.tile_size, rng.uniform(start_y, end_y) * config.tile_size)
+                     for _ in enemies]
+
+        scalar, scalar_positions = measure(enemies, check_tile_collisions_one_by_one, positions)
+        batched, batched_positions = measure(enemies, entity_manager.check_tile_collisions, positions)
+        identical = scalar_positions == batched_positions
+        print(f"{count:>7} {scalar:>12.2f} {batched:>13.2f} {str(identical):>10}")
+    pygame.quit()
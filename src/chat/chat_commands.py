@@ -11,6 +11,64 @@ class UserMistake(Exception):
     """Exception thrown when a user makes a mistake."""
 
 
+def get_fuzzy_score(name: str, text: str):
+    """Returns how well the characters of text match name in order (lower is better), or None if they don't."""
+    indexes = []
+    index = 0
+    for character in text:
+        index = name.find(character, index)
+        if index == -1:
+            return None
+        indexes.append(index)
+        index += 1
+    if not indexes:
+        return 0, 0, len(name), name
+    gaps = indexes[-1] - indexes[0] + 1 - len(indexes)
+    return gaps, indexes[0], len(name), name
+
+
+def rank_matches(names, text: str) -> list:
+    """Returns the names starting with text, shortest first, or else the names matching it fuzzily, best first."""
+    matches = sorted((name for name in names if name.startswith(text)), key=lambda name: (len(name), name))
+    if matches:
+        return matches
+    scores = (get_fuzzy_score(name, text) for name in names)
+    return [score[-1] for score in sorted(score for score in scores if score is not None)]
+
+
+class CommandTrie:
+    """
+    Prefix tree of the command names of a command set.
+
+    Each node keeps the names below it, ranked, so that completing a prefix only walks the prefix.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.root = ({}, list(self.names))  # (character -> child node, names below the node)
+        for name in self.names:
+            node = self.root
+            for character in name:
+                if character not in node[0]:
+                    node[0][character] = ({}, [])
+                node = node[0][character]
+                node[1].append(name)
+        self.sort_names(self.root)
+
+    def sort_names(self, node):
+        node[1].sort(key=lambda name: (len(name), name))
+        for child in node[0].values():
+            self.sort_names(child)
+
+    def complete(self, text: str) -> list:
+        node = self.root
+        for character in text:
+            node = node[0].get(character)
+            if node is None:
+                return rank_matches(self.names, text)  # No name starts with text, falls back to the fuzzy matches
+        return list(node[1])
+
+
 class CommandManager:
     @staticmethod
     def create_commands() -> set:
@@ -109,21 +167,11 @@ class Chat(CommandManager):
             return True
         return False
 
-    def complete(self, text):
-        if not self.is_command(text):
-            return ()
-
-        current_text = self.remove_prefix(text)
-        leaf = self.tree.copy()
-
-        while " " in current_text:
-            word, current_text = current_text.split(" ", 1)
-            if word not in leaf:
-                break
-
-            leaf = leaf[word]
-
-        return filter(lambda x: x.startswith(current_text), leaf)
+    def complete(self, text) -> list:
+        """Returns the completions of the last word of the text, best first."""
+        if not self.is_command(text) or self.command_set is None:
+            return []
+        return self.command_set.complete(self.remove_prefix(text))
 
     def error_manager(self):
         return ErrorManager(self)
@@ -176,6 +224,7 @@ class CommandSetBase:
         self.commands = {}
         self.chat = chat
         self.parent = parent
+        self.trie = None  # Built when the commands are loaded, and again after adding one
 
     @classmethod
     def is_command(cls, message: str) -> bool:
@@ -201,10 +250,22 @@ class CommandSetBase:
         if command_name in self.commands:
             raise KeyError(f"This command already exists : {command_name}")
         self.commands[command_name] = command
+        self.trie = None
 
     def load_commands(self):
         for command in self.commands.values():
             command.load()
+        self.trie = CommandTrie(self.commands)
+
+    def complete(self, text: str) -> list:
+        """Returns the completions of the last word of the text, from the command names or the command arguments."""
+        if " " in text:
+            command_name, argument = text.split(" ", 1)
+            command = self.commands.get(command_name)
+            return command.complete(argument) if command is not None else []
+        if self.trie is None:
+            self.trie = CommandTrie(self.commands)
+        return self.trie.complete(text)
 
     def call_command(self, command_name: str, argument: str):
         if not (not command_name or command_name in self.commands):
@@ -252,6 +313,8 @@ class Command:
     add()
     load()
         Function triggered when the command is loaded (should be when creating a chat).
+    complete(argument: str)
+        Completions of the last word of the argument (override it to complete the arguments).
 
     """
     # Base class of commands, you can create custom commands by overriding load and __call__
@@ -308,6 +371,10 @@ class Command:
     def add(self):
         self.command_set.add_command(self)
 
+    def complete(self, argument: str) -> list:
+        _ = argument  # To avoid unused arguments warnings
+        return []
+
     def load(self):
         load_message = f"Loading {self.name}..."
         self.chat.send_message(load_message)  # Do some stuff... (sends a message on loading)
@@ -337,6 +404,9 @@ class CommandGroup(Command, CommandManager):
     def load(self):
         self.install_commands(self.sub_command_set)
 
+    def complete(self, argument: str) -> list:
+        return self.sub_command_set.complete(argument)
+
     def __call__(self, argument: str):
         if argument.strip(" "):
             self.sub_command_set.dispatch_command(argument)
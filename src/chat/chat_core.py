@@ -1,4 +1,6 @@
+from collections import deque
 from enum import Enum
+from itertools import count, islice
 
 from src.config.game_data import GameData
 from src.chat.commands import Commands
@@ -18,15 +20,17 @@ class Command:
 
 class ChatCore:
     def __init__(self, game):
-        self.messages = []
         self.game = game
         self.data = GameData()
+        # (id, text) of the last messages, the oldest being dropped when adding one beyond the limit
+        self.messages = deque(maxlen=self.data.Chat.max_messages)
+        self.message_ids = count()  # Increasing ids, so that a message can be told apart from an equal one
         self.commands = Commands.create_chat(self, game)
 
     def show_message(self, message):
         """Shows a message in the chat."""
-        self.messages.append(message)
         self.trim_messages()
+        self.messages.append((next(self.message_ids), message))
 
     def add_message(self, message):
         """Adds a message received by the user to the chat."""
@@ -34,17 +38,18 @@ class ChatCore:
 
     def send_error_log(self, message, level=ErrorLevel.ERROR):
         """Sends an error message in the chat."""
-        self.messages.append(f"{level.value} Error: {message}")
-        self.trim_messages()
+        self.show_message(f"{level.value} Error: {message}")
 
     def trim_messages(self):
-        """Removes messages out of the limit specified by the configuration."""
-        while len(self.messages) > self.data.Chat.max_messages:
-            self.messages.pop(0)
+        """Removes messages out of the limit specified by the configuration, if it changed."""
+        if self.messages.maxlen != self.data.Chat.max_messages:
+            self.messages = deque(self.messages, maxlen=self.data.Chat.max_messages)
 
-    def get_messages(self):
-        """Reverses the list of actual messages in the chat."""
-        return self.messages
+    def get_messages(self, limit=None):
+        """Returns the (id, text) of the last limit messages in the chat ( all by default ), oldest first."""
+        if limit is None:
+            return list(self.messages)
+        return list(islice(reversed(self.messages), limit))[::-1]
 
     def clear_last_message(self, args=None):
         """Removes last message of the chat."""
@@ -2,6 +2,9 @@ import pygame
 import pygame.freetype
 
 from src.config.game_data import GameData
+from src.utils.colors import Color
+from src.utils.glyph_atlas import GlyphAtlas
+from src.utils.profiler import FrameProfiler
 from src.utils.utils import format_text, draw_formatted_message
 
 
@@ -14,8 +17,11 @@ class ChatUI:
         self.input_text = ""
         self.cursor_pos = 0
         self.chat_surfaces = []
+        self.message_surfaces = {}  # Id of a shown message -> its surface, so that each message is rendered once
+        self.shown_state = None  # (newest id, messages, limit) of the chat the surfaces were made for
         self.input_surface = None
         self.completer_surface = None
+        self.completer_text = None  # Input text the completer surface was made for
         self.update_surfaces()
         self.message_history = []
         self.history_index = -1
@@ -28,6 +34,7 @@ class ChatUI:
                               "#@&%$=+-/,.!?;:()[]{}<> '")
 
         if event.type == pygame.KEYDOWN:
+            previous_input = (self.input_text, self.cursor_pos)
             if event.key == pygame.K_RETURN:
                 if self.input_text.strip():
                     self.chat.add_message(self.input_text)
@@ -58,7 +65,9 @@ class ChatUI:
                     self.input_text = self.input_text[:self.cursor_pos] + event.unicode + self.input_text[self.cursor_pos:]
                     self.cursor_pos += 1
 
-            self.update_surfaces()  # Ensure surfaces are updated on each input change
+            if (self.input_text, self.cursor_pos) != previous_input:
+                self.update_input_surface()
+                self.update_completer_surface()
 
     def navigate_message_history(self, direction):
         if direction == -1:
@@ -77,56 +86,88 @@ class ChatUI:
             self.input_text = ""
 
     def update_surfaces(self):
-        # TODO: You should split this function into smaller pieces
-        # TODO: Handle newlines
-        completer_texts = self.update_completer()
-
-        # Update chat surface
-        self.chat_surfaces.clear()
-        recent_messages = self.chat.get_messages()[-self.config.Chat.max_shown_messages:]
-
-        for message in reversed(recent_messages):
-            message_surface = pygame.Surface((self.config.Chat.width, self.config.Chat.font_size), pygame.SRCALPHA)
-            message_surface.fill((30, 30, 30, 127))
-            draw_formatted_message(self.chat_font, message_surface, format_text(message), (5, 5))
-            self.chat_surfaces.append(message_surface)
+        self.update_chat_surfaces()
+        self.update_input_surface()
+        self.update_completer_surface()
 
+    def render_message(self, message):
+        # TODO: Handle newlines
+        message_surface = pygame.Surface((self.config.Chat.width, self.config.Chat.font_size), pygame.SRCALPHA)
+        message_surface.fill((30, 30, 30, 127))
+        draw_formatted_message(self.chat_font, message_surface, format_text(message), (5, 5))
+        FrameProfiler.count("surfaces")
+        return message_surface
+
+    def update_chat_surfaces(self):
+        """Renders the messages newly shown, the others keeping their surface."""
+        # Messages are only added at the end or removed, either of which changes the newest id or the count
+        messages = self.chat.messages
+        limit = self.config.Chat.max_shown_messages
+        state = (messages[-1][0] if messages else None, len(messages), limit)
+        if state == self.shown_state:
+            return
+        self.shown_state = state
+        recent_messages = self.chat.get_messages(limit)
+
+        message_surfaces = {}
+        for message_id, message in recent_messages:
+            message_surfaces[message_id] = self.message_surfaces.get(message_id) or self.render_message(message)
+        self.message_surfaces = message_surfaces  # Forgets the messages no longer shown
+        self.chat_surfaces = [message_surfaces[message_id] for message_id, _ in reversed(recent_messages)]
+
+    def update_input_surface(self):
         # Update input surface width based on input text width
         input_text_width = self.chat_font.get_rect(self.input_text).width
         input_surface_width = input_text_width + 10
         input_surface = pygame.Surface((input_surface_width, self.config.Chat.font_size), pygame.SRCALPHA)
         input_surface.fill((30, 30, 30, 127))
-        self.chat_font.render_to(input_surface, (5, 5), self.input_text, (255, 255, 255))
+        GlyphAtlas.get(self.chat_font, Color.WHITE).render_to(input_surface, (5, 5), self.input_text)
 
         # Draw the cursor
         cursor_x_pos = self.chat_font.get_rect(self.input_text[:self.cursor_pos]).width + 5
         pygame.draw.rect(input_surface, (0, 255, 0), (cursor_x_pos - 1, 0, 2, self.config.Chat.font_size))
 
         self.input_surface = input_surface
+        FrameProfiler.count("surfaces")
+
+    def update_completer_surface(self):
+        if self.input_text == self.completer_text:
+            return
+        self.completer_text = self.input_text
+        completer_texts = self.update_completer()
 
-        # Update completer surface
         completer_surface_height = self.config.Chat.font_size * len(completer_texts)
         completer_surface = pygame.Surface((200, completer_surface_height), pygame.SRCALPHA)
         completer_surface.fill((32, 32, 32, 127))
         y_offset = completer_surface_height - self.config.Chat.font_size  # Commencer depuis le bas
+        atlas = GlyphAtlas.get(self.chat_font, Color.WHITE)
         for text in completer_texts:
-            self.chat_font.render_to(completer_surface, (5, y_offset + 5), text, (255, 255, 255))
+            atlas.render_to(completer_surface, (5, y_offset + 5), text)
             y_offset -= self.config.Chat.font_size  # Déplacer vers le haut pour le texte suivant
         self.completer_surface = completer_surface
+        FrameProfiler.count("surfaces")
 
     def draw(self):
+        """Draws the chat and returns the rects drawn."""
+        self.update_chat_surfaces()  # Messages may have been added by the commands
+        dirty_rects = []
         y_offset = self.config.window_height - 80
         for surface in self.chat_surfaces:
-            self.screen.blit(surface, (0, y_offset))
+            dirty_rects.append(self.screen.blit(surface, (0, y_offset)))
+            FrameProfiler.count("blits")
             y_offset -= surface.get_height()
 
         x, y = (0, self.config.window_height - self.input_surface.get_height() - 2)
         if self.input_surface and self.config.Chat.chat_open:
-            self.screen.blit(self.input_surface, (x, y))
+            dirty_rects.append(self.screen.blit(self.input_surface, (x, y)))
+            FrameProfiler.count("blits")
 
         if self.completer_surface and self.config.Chat.chat_open:
             x += self.input_surface.get_width()
-            self.screen.blit(self.completer_surface, (x, y - self.completer_surface.get_height()))
+            dirty_rects.append(self.screen.blit(self.completer_surface, (x, y - self.completer_surface.get_height())))
+            FrameProfiler.count("blits")
+
+        return dirty_rects
 
     def update_completer(self):
-        return  set(self.chat.commands.complete(self.input_text))
+        return self.chat.commands.complete(self.input_text)
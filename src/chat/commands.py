@@ -1,4 +1,4 @@
-from src.chat.chat_commands import Command, CommandGroup, Chat
+from src.chat.chat_commands import Command, CommandGroup, Chat, rank_matches
 import traceback
 
 
@@ -96,8 +96,10 @@ class Teleport(Command):
             return
 
         x, y = map(int, argument)
+        pos = (x * self.chat.game.config.tile_size, y * self.chat.game.config.tile_size)
 
-        self.chat.game.level.player.fall((x * self.chat.game.config.tile_size, y * self.chat.game.config.tile_size))
+        self.chat.game.level.tiles_map.load_around(pos)
+        self.chat.game.level.player.fall(pos)
 
         self.chat.send_message(f"Teleported to ({x}, {y}).")
 
@@ -124,10 +126,86 @@ class Summon(Command):
 
         entity_name, x, y = argument[0], int(argument[1]), int(argument[2])
 
-        self.chat.game.level.entity_manager.spawn_entity(entity_name, (x, y))
+        if not self.chat.game.level.entity_manager.spawn_entity(entity_name, (x, y)):
+            self.chat.send_message(f"Unknown entity {entity_name}.")
+            return
 
         self.chat.send_message(f"Summoned {entity_name} at ({x}, {y}).")
 
+    def complete(self, argument: str) -> list:
+        if " " in argument:  # Only the entity name is completed
+            return []
+        return rank_matches(self.chat.game.level.entity_manager.spawnable_entities, argument)
+
+
+class ProfileStart(Command):
+    name = "start"
+    help_message = """Profiles the game for the given number of frames, or until /debug profile stop."""
+
+    def __call__(self, argument: str):
+        argument = argument.strip()
+        profiler = self.chat.game.session_profiler
+
+        if profiler.running:
+            self.chat.send_message("The game is already being profiled.")
+            return
+
+        if argument and not argument.isdigit():
+            self.chat.send_message("Invalid number of frames.")
+            return
+
+        frames = int(argument) if argument else None
+        profiler.start(frames, self.finish)
+
+        self.chat.send_message(f"Profiling for {frames} frames..." if frames else "Profiling...")
+
+    def finish(self):
+        dump_profile(self.chat)
+
+
+class ProfileStop(Command):
+    name = "stop"
+    help_message = """Stops profiling and shows the slowest functions."""
+
+    def __call__(self, argument: str):
+        profiler = self.chat.game.session_profiler
+
+        if not profiler.running:
+            self.chat.send_message("The game is not being profiled.")
+            return
+
+        profiler.stop()
+        send_profile_summary(self.chat)
+
+
+class ProfileDump(Command):
+    name = "dump"
+    help_message = """Writes the last profile as pstats and collapsed stacks files."""
+
+    def __call__(self, argument: str):
+        profiler = self.chat.game.session_profiler
+
+        if profiler.profile is None:
+            self.chat.send_message("Nothing was profiled yet.")
+            return
+
+        if profiler.running:
+            profiler.stop()
+        dump_profile(self.chat)
+
+
+def send_profile_summary(chat):
+    profiler = chat.game.session_profiler
+    chat.send_message(f"&7Slowest functions over {profiler.frames} frames:")
+    for name, calls, time_per_frame in profiler.get_slowest(chat.game.config.profile_summary_size):
+        chat.send_message(f"&e{time_per_frame * 1000:.2f} ms &7{calls} calls &f{name}")
+
+
+def dump_profile(chat):
+    pstats_path, collapsed_path, samples = chat.game.session_profiler.dump(chat.game.config.profile_directory)
+    send_profile_summary(chat)
+    chat.send_message(f"&7Written {pstats_path} and {collapsed_path} ({samples} stack samples).")
+
 
 # Command Groups
 
@@ -155,6 +233,28 @@ class GameCommands(CommandGroup):
         }
 
 
+class ProfileCommands(CommandGroup):
+    name = "profile"
+
+    @staticmethod
+    def create_commands():
+        return {
+            ProfileStart,
+            ProfileStop,
+            ProfileDump,
+        }
+
+
+class DebugCommands(CommandGroup):
+    name = "debug"
+
+    @staticmethod
+    def create_commands():
+        return {
+            ProfileCommands,
+        }
+
+
 # Chats
 
 class Commands(GameChat):
@@ -163,6 +263,7 @@ class Commands(GameChat):
         return {
             ChatCommands,
             GameCommands,
+            DebugCommands,
         }
 
 
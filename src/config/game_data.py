@@ -10,20 +10,44 @@ class GameData:
     window_caption: str = "ArcadiaTales"  # Caption for the game window
     game_version: str = "0.1.3"  # Version of the game
     max_fps: int = 240  # Maximum frames per second
+    simulation_rate: int = 60  # Simulation updates per second ( 0 = one update per frame, with the frame time )
+    max_simulation_steps: int = 5  # Maximum simulation updates in a frame to catch up, the rest is dropped
+    input_recording_path: str | None = None  # File where the input of every simulation tick is recorded
+    dirty_rects_rendering: bool = False  # Whether to update only the changed parts of the window while the camera is still
     debug_level: int = 0  # Debug level
-    # ( 0 = False, 1 = infos, 2 = sprite_collide_rects, 3 = tile_collide_rects, 4 = all)
+    # ( 0 = False, 1 = infos, 2 = sprite_collide_rects, 3 = tile_collide_rects, 4 = all, 5 = profiler)
+    profiler_refresh_frames: int = 30  # Frames between two refreshes of the profiler texts
+    profile_directory: str = "profiles"  # Directory where the /debug profile captures are written
+    profile_sample_interval: float = 0.005  # Time between two samples of the call stack ( in s )
+    profile_summary_size: int = 5  # Slowest functions shown in the chat after a capture
 
     tile_scale: int = 4  # Scale of the tiles
     tile_image_size: int = 16  # Size of the tile images
     tile_size: int = tile_image_size * tile_scale  # Size of the tiles
 
-    map_size = 50  # Size of the map ( in tiles )
+    map_size = 50  # Size of the map ( in tiles ), only the spawn area in an infinite world
+    infinite_world: bool = True  # Whether the map is endless instead of surrounded by walls
     noise_map_seed = -1  # Seed for the noise map
+    tile_variants_seed = 0  # Seed for the variants of the tiles
     noise_map_octaves = 4  # Octaves for the noise map
     noise_map_scale = 50  # Scale for the noise map
     noise_map_floor = -0.1  # Floor for the noise map
+    chunk_size = 32  # Size of the generated chunks ( in tiles )
+    chunk_prefetch_distance = 1  # Chunks loaded around the visible ones ( in chunks )
+    chunk_cache_memory = 16 * 1024 * 1024  # Memory budget of the loaded chunks ( in bytes )
+    chunk_workers = 2  # Processes generating the chunks ( 0 to generate them on the main thread )
+    chunk_load_time_budget = 0.002  # Time spent loading the generated chunks per frame ( in seconds )
+    render_chunk_size = 8  # Size of the pre-rendered map pieces ( in tiles, must divide chunk_size )
 
     entities_generator_seed = 0  # Seed for the entities generator
+    spatial_hash_cell_size = 128  # Size of the cells of the entities spatial index ( in pixels )
+    camera_cull_margin = 256  # Distance out of the window where the sprites are still drawn ( in pixels )
+    enemy_activity_tiers: bool = True  # Updates the far enemies less often, and not at all when farther
+    enemy_throttle_distance = 1024  # Distance out of the drawn area where the enemies are updated less often ( in pixels )
+    enemy_throttle_interval = 4  # Ticks between two updates of the enemies updated less often
+    flow_field_radius = 12  # Distance around the player where the enemies find their way to it ( in tiles, 0 = straight )
+    batched_tile_collisions: bool = True  # Resolves the tile collisions of the enemies in one NumPy pass
+    vectorized_enemies: bool = False  # Simulates the slimes on NumPy arrays instead of updating each sprite
 
     show_player_inventory: bool = False  # Whether to show the player's inventory
     player_speed: int = 100  # Speed of the player
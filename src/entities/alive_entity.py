@@ -1,5 +1,6 @@
 from src.entities.animated_entity import AnimatedEntity
 from src.overlays.health_bar import HealthBar
+from src.overlays.nameplate import Nameplate
 
 
 class AliveEntity(AnimatedEntity):
@@ -12,6 +13,7 @@ class AliveEntity(AnimatedEntity):
         self.is_alive = True
 
         self.health_bar = HealthBar(self, 60, 8)
+        self.nameplate = Nameplate(self)
 
     def take_damage(self, damage):
         self.health -= damage*(1 - self.defense/100)
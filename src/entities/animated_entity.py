@@ -1,8 +1,7 @@
-import pygame
 from pygame import Vector2
 
+from src.entities.animation_registry import AnimationRegistry
 from src.entities.graphic_entity import GraphicEntity
-from src.utils.utils import import_folder
 
 
 class AnimatedEntity(GraphicEntity):
@@ -19,14 +18,7 @@ class AnimatedEntity(GraphicEntity):
 
     def import_assets(self, scale=1):
         if self.assets_folder is not None:
-            for animation in self.animations.keys():
-                full_path = f'assets/images/entities/{self.assets_folder}/' + animation
-                animation_images = import_folder(full_path)
-                for index, image in enumerate(animation_images):
-                    scaled_width = int(image.get_width() * scale)
-                    scaled_height = int(image.get_height() * scale)
-                    animation_images[index] = pygame.transform.scale(image, (scaled_width, scaled_height))
-                self.animations[animation] = animation_images
+            self.animations = AnimationRegistry.get_animations(self.assets_folder, self.animations.keys(), scale)
             self.image = self.animations[self.current_animation][int(self.current_frame)]
         else:
             raise ValueError("assets_folder is None")
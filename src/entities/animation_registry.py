@@ -0,0 +1,38 @@
+from types import MappingProxyType
+
+import pygame
+
+from src.utils.utils import import_folder
+
+
+class AnimationRegistry:
+    """Process-wide cache of the animation frames, loaded and scaled once per (assets_folder, scale).
+
+    Every entity using the same assets shares the same read-only animations: a mapping from the animation
+    names to tuples of frames.
+    """
+
+    _animations = {}  # (assets_folder, scale) -> {animation name: tuple of frames}
+
+    @classmethod
+    def get_animations(cls, assets_folder, animation_names, scale=1):
+        animations = cls._animations.setdefault((assets_folder, scale), {})
+        for animation in animation_names:
+            if animation not in animations:
+                animations[animation] = cls.load_animation(assets_folder, animation, scale)
+        return MappingProxyType(animations)
+
+    @staticmethod
+    def load_animation(assets_folder, animation, scale):
+        full_path = f'assets/images/entities/{assets_folder}/' + animation
+        animation_images = import_folder(full_path)
+        for index, image in enumerate(animation_images):
+            scaled_width = int(image.get_width() * scale)
+            scaled_height = int(image.get_height() * scale)
+            animation_images[index] = pygame.transform.scale(image, (scaled_width, scaled_height))
+        return tuple(animation_images)
+
+    @classmethod
+    def clear(cls):
+        """Forgets every loaded animation, for example to reload the assets."""
+        cls._animations.clear()
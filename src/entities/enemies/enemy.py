@@ -13,6 +13,7 @@ class Enemy(AliveEntity):
                          image_offset=image_offset,
                          name_offset=name_offset)
         self.target = None
+        self.flow_field = None  # Paths to the player around walls, the enemy goes straight at its target without them
 
     def set_target(self, target):
         self.target = target
@@ -26,7 +27,8 @@ class Enemy(AliveEntity):
         if distance.length() > 10 * self.config.tile_size:
             self.direction = Vector2()
         elif distance.length() > 2 * self.config.tile_size:
-            self.direction = distance.normalize()
+            flow_direction = self.flow_field.get_direction(self.pos) if self.flow_field is not None else None
+            self.direction = flow_direction if flow_direction is not None else distance.normalize()
         else:
             self.direction = Vector2()
 
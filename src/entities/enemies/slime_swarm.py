@@ -0,0 +1,159 @@
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
+
+from src.config.game_data import GameData
+
+DIRECTIONS = ("right", "left", "down", "up")
+STATES = ("idle", "walk")
+ANIMATION_SPEEDS = (4, 8)  # Animation speed of each state
+
+
+class SlimeSwarm:
+    """Simulates the slimes on NumPy arrays, one row per slime, instead of updating every sprite on its own.
+
+    Chasing, moving and animating are done in the same order and with the same operations as ``Slime.update``,
+    the sprites being only views kept in sync for the collisions, the drawing and the commands (``current_frame``
+    is only written when the image changes).
+    """
+
+    def __init__(self, flow_field=None):
+        self.config = GameData()
+        self.flow_field = flow_field
+        self.slimes = []
+        self.indexes = {}  # Slime -> row in the arrays
+        self.positions = np.empty((0, 2))
+        self.directions = np.empty((0, 2))
+        self.speeds = np.empty(0)
+        self.frames = np.empty(0)  # Current frame of the animation, as a float
+        self.animation_directions = np.empty(0, dtype=np.int64)  # Index in DIRECTIONS
+        self.animations = None  # Frames of every (direction, state) animation, shared by the slimes
+        self.frame_counts = None
+        self.previous_animations = np.empty(0, dtype=np.int64)  # Animation pushed to each sprite
+        self.previous_image_indexes = np.empty(0, dtype=np.int64)  # Frame pushed to each sprite
+
+    def __len__(self):
+        return len(self.slimes)
+
+    def __contains__(self, slime):
+        return slime in self.indexes
+
+    def load_animations(self, slime):
+        self.animations = [[slime.animations[direction + "_" + state] for state in STATES] for direction in DIRECTIONS]
+        self.frame_counts = np.array([[len(frames) for frames in row] for row in self.animations])
+
+    def add(self, slime):
+        if self.animations is None:
+            self.load_animations(slime)
+        self.indexes[slime] = len(self.slimes)
+        self.slimes.append(slime)
+        self.positions = np.vstack((self.positions, (slime.pos.x, slime.pos.y)))
+        self.directions = np.vstack((self.directions, (slime.direction.x, slime.direction.y)))
+        self.speeds = np.append(self.speeds, slime.speed)
+        self.frames = np.append(self.frames, slime.current_frame)
+        self.animation_directions = np.append(self.animation_directions,
+                                              DIRECTIONS.index(slime.animation_direction))
+        # Unknown yet, so that the first update pushes everything
+        self.previous_animations = np.append(self.previous_animations, -1)
+        self.previous_image_indexes = np.append(self.previous_image_indexes, -1)
+
+    def remove(self, slime):
+        """Removes the slime by moving the last row in its place."""
+        index = self.indexes.pop(slime)
+        last = len(self.slimes) - 1
+        if index != last:
+            last_slime = self.slimes[last]
+            self.slimes[index] = last_slime
+            self.indexes[last_slime] = index
+            for array in (self.positions, self.directions, self.speeds, self.frames, self.animation_directions,
+                          self.previous_animations, self.previous_image_indexes):
+                array[index] = array[last]
+        self.slimes.pop()
+        self.positions = self.positions[:last]
+        self.directions = self.directions[:last]
+        self.speeds = self.speeds[:last]
+        self.frames = self.frames[:last]
+        self.animation_directions = self.animation_directions[:last]
+        self.previous_animations = self.previous_animations[:last]
+        self.previous_image_indexes = self.previous_image_indexes[:last]
+
+    def pull(self):
+        """Reads back the positions and targets of the sprites, which the collisions and the commands may change."""
+        self.positions = np.fromiter(chain.from_iterable(map(attrgetter("pos"), self.slimes)), np.float64,
+                                     2 * len(self.slimes)).reshape(-1, 2)
+        targets = list(map(attrgetter("target"), self.slimes))
+        target_positions = {target: (np.nan, np.nan) if target is None else (target.pos.x, target.pos.y)
+                            for target in set(targets)}
+        if len(target_positions) == 1:  # Usually, every slime chases the player
+            return np.broadcast_to(next(iter(target_positions.values())), self.positions.shape)
+        return np.array([target_positions[target] for target in targets])
+
+    def animate(self, dt, states):
+        self.frames += np.take(ANIMATION_SPEEDS, states) * dt
+        self.frames[self.frames >= self.frame_counts[self.animation_directions, states]] = 0
+
+    def update(self, dt):
+        if not self.slimes:
+            return
+        targets = self.pull()
+
+        # Slime.update_animation_state, from the direction of the previous tick
+        direction_x, direction_y = self.directions[:, 0], self.directions[:, 1]
+        self.animation_directions = np.select([direction_x > 0, direction_x < 0, direction_y > 0, direction_y < 0],
+                                              [0, 1, 2, 3], self.animation_directions)
+        states = ((direction_x != 0) | (direction_y != 0)).astype(np.int64)
+        self.animate(dt, states)
+
+        # Enemy.move_towards_target, slimes without a target keep their direction
+        previous_directions = self.directions.copy()
+        distances = targets - self.positions
+        lengths = np.sqrt(distances[:, 0] * distances[:, 0] + distances[:, 1] * distances[:, 1])
+        chasing = (lengths > 2 * self.config.tile_size) & (lengths <= 10 * self.config.tile_size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            chase_directions = distances / lengths[:, None]
+        if self.flow_field is not None:
+            flow_directions = self.flow_field.get_directions(self.positions)
+            chase_directions = np.where(np.isnan(flow_directions), chase_directions, flow_directions)
+        has_target = ~np.isnan(lengths)
+        self.directions[has_target] = np.where(chasing[:, None], chase_directions, 0)[has_target]
+
+        # Entity.move
+        magnitudes = np.sqrt(self.directions[:, 0] * self.directions[:, 0]
+                             + self.directions[:, 1] * self.directions[:, 1])
+        moving = magnitudes > 0
+        self.directions[moving] /= magnitudes[moving, None]
+        self.positions += self.directions * self.speeds[:, None] * dt * self.config.tile_scale
+
+        # AnimatedEntity.update animates a second time
+        self.animate(dt, states)
+
+        animations = self.animation_directions * len(STATES) + states
+        image_indexes = animations * self.frame_counts.max() + self.frames.astype(np.int64)
+        self.push(moving, (self.directions != previous_directions).any(axis=1),
+                  animations != self.previous_animations, image_indexes != self.previous_image_indexes, states)
+        self.previous_animations = animations
+        self.previous_image_indexes = image_indexes
+
+    def push(self, moved, turned, animation_changed, image_changed, states):
+        """Writes back to the sprites only the state that changed, as most slimes idle far from the player."""
+        indexes = np.flatnonzero(moved)
+        for index, (x, y) in zip(indexes.tolist(), self.positions[indexes].tolist()):
+            slime = self.slimes[index]
+            slime.pos.update(x, y)
+            slime.collide_rect = slime.get_collide_rect()
+        indexes = np.flatnonzero(turned)
+        for index, (direction_x, direction_y) in zip(indexes.tolist(), self.directions[indexes].tolist()):
+            self.slimes[index].direction.update(direction_x, direction_y)
+        for index in np.flatnonzero(animation_changed).tolist():
+            slime = self.slimes[index]
+            state = int(states[index])
+            slime.animation_direction = DIRECTIONS[int(self.animation_directions[index])]
+            slime.animation_state = STATES[state]
+            slime.animation_speed = ANIMATION_SPEEDS[state]
+            slime.current_animation = slime.animation_direction + "_" + slime.animation_state
+        for index in np.flatnonzero(image_changed).tolist():
+            slime = self.slimes[index]
+            frame = float(self.frames[index])
+            slime.current_frame = frame
+            slime.image = self.animations[int(self.animation_directions[index])][int(states[index])][int(frame)]
@@ -1,54 +1,89 @@
-import random
+from collections import defaultdict
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
 import pygame
-from pyqtree import Index
 from src.entities.enemies.slime import Slime
+from src.entities.enemies.slime_swarm import SlimeSwarm
 from src.entities.player import Player
+from src.entities.spatial_hash import SpatialHash
+from src.map.flow_field import FlowField
+from src.map.tile_map import SOLID_TILES
+from src.utils.profiler import FrameProfiler
+from src.utils.random_streams import RandomStreams
 from src.utils.utils import Direction
 
 class EntityManager:
+    spawnable_entities = {"slime": Slime}  # Name -> class of the entities spawn_entity knows
+
     def __init__(self, config, player, all_sprites, tile_map_generator) -> None:
         self.config = config
         self.player = player
         self.all_sprites = all_sprites
         self.tile_map_generator = tile_map_generator
         self.enemies = []
+        self.spawn_orders = {}  # Enemy -> number of enemies spawned before it, a stable order between runs
+        self.spawned_enemies = 0
+        self.tick = 0
+        self.solid_tiles = {}  # (chunk_x, chunk_y) -> (versions of the chunks read, solidity of its tiles)
+        self.flow_field = None
+        if self.config.flow_field_radius:
+            self.flow_field = FlowField(self.tile_map_generator.tiles_map, self.config.flow_field_radius)
+        self.slime_swarm = SlimeSwarm(self.flow_field) if self.config.vectorized_enemies else None
 
-        bbox = (0, 0, self.config.window_width, self.config.window_height)
-        self.quadtree = Index(bbox=bbox)
-        self.quadtree_items = set()
+        # Collision handlers of each pair of entity types, called with every colliding pair of a tick
+        self.collision_handlers = {
+            (Player, Slime): self.handle_player_slime_collisions,
+            (Slime, Slime): self.handle_slime_slime_collisions,
+        }
+
+        # Live index of where the entities are, updated when they move
+        self.spatial_hash = SpatialHash(cell_size=self.config.spatial_hash_cell_size)
 
         self.generate_random_slimes()
 
-        # Insert player into QuadTree
-        self.quadtree.insert(item=self.player, bbox=self.player.collide_rect)
+        # Insert player into the spatial hash
+        self.spatial_hash.insert(self.player, self.player.collide_rect)
 
-        # Insert enemies into QuadTree
+        # Insert enemies into the spatial hash
         for enemy in self.enemies:
-            self.quadtree.insert(item=enemy, bbox=enemy.collide_rect)
+            self.spatial_hash.insert(enemy, enemy.collide_rect)
 
     def generate_random_slimes(self) -> None:
-        path_tiles = [pos for pos, tile in self.tile_map_generator.tiles_map.items() if tile.tile_id == 1]
+        start_x, start_y, end_x, end_y = self.tile_map_generator.get_world_bounds()
+        path_tiles = self.tile_map_generator.tiles_map.get_positions(1, start_x, start_y,
+                                                                     end_x - start_x, end_y - start_y)
         slime_count = 50
         slime_names = ["Slime", "Slimey", "Gooey", "Squishy", "Blobby", "Jelly", "Squidgy", "Sloppy", "Sloshy"]
         color = "&c"
 
         for i in range(slime_count):
-            pos = random.choice(path_tiles)
+            pos = RandomStreams.get("entities").choice(path_tiles)
             slime = Slime(group=self.all_sprites, pos=pos)
             slime.target = self.player
             slime.name = color + slime_names[i % len(slime_names)]
-            self.enemies.append(slime)
+            self.add_enemy(slime)
+
+    def add_enemy(self, enemy) -> None:
+        self.enemies.append(enemy)
+        enemy.flow_field = self.flow_field
+        self.spawn_orders[enemy] = self.spawned_enemies
+        self.spawned_enemies += 1
+        if self.slime_swarm is not None:
+            self.slime_swarm.add(enemy)
 
     def add_entity(self, entity) -> None:
-        self.quadtree.insert(item=entity, bbox=entity.collide_rect)
-        self.quadtree_items.add(entity)
+        self.spatial_hash.insert(entity, entity.collide_rect)
 
     def remove_entity(self, entity) -> None:
         if entity in self.enemies:
             self.enemies.remove(entity)
-        if entity in self.quadtree_items:
-            self.quadtree.remove(item=entity, bbox=entity.collide_rect)
-            self.quadtree_items.remove(entity)
+            del self.spawn_orders[entity]
+        if self.slime_swarm is not None and entity in self.slime_swarm:
+            self.slime_swarm.remove(entity)
+        if entity in self.spatial_hash:
+            self.spatial_hash.remove(entity)
         if entity in self.all_sprites:
             self.all_sprites.remove(entity)
 
@@ -57,16 +92,81 @@ class EntityManager:
         for dy in range(-1, 2):
             for dx in range(-1, 2):
                 x, y = entity_tile_pos.x + dx, entity_tile_pos.y + dy
-                if (x, y) in self.tile_map_generator.tiles_map:
-                    tile = self.tile_map_generator.tiles_map[(x, y)]
-                    if tile.tile_id == 2 or tile.tile_id == 0:
-                        tile_rect = pygame.Rect(x * self.config.tile_size + self.config.tile_size / 2,
-                                                y * self.config.tile_size + self.config.tile_size / 2,
-                                                self.config.tile_size,
-                                                self.config.tile_size)
-                        if entity.collide_rect.colliderect(tile_rect):
-                            direction = self.get_collision_direction(entity.collide_rect, tile_rect)
-                            entity.collide_with(tile_rect, direction)
+                tile_id = self.tile_map_generator.tiles_map.get(x, y)
+                if tile_id in SOLID_TILES:
+                    tile_rect = pygame.Rect(x * self.config.tile_size + self.config.tile_size / 2,
+                                            y * self.config.tile_size + self.config.tile_size / 2,
+                                            self.config.tile_size,
+                                            self.config.tile_size)
+                    if entity.collide_rect.colliderect(tile_rect):
+                        direction = self.get_collision_direction(entity.collide_rect, tile_rect)
+                        entity.collide_with(tile_rect, direction)
+
+    def get_solid_tiles(self, chunk_x, chunk_y, solid_tiles):
+        """Returns whether the tiles of the chunk and of a one tile border around it are solid.
+
+        The grids of the last call are reused (from solid_tiles) while none of the chunks read changed.
+        """
+        tiles_map = self.tile_map_generator.tiles_map
+        chunk_size = self.config.chunk_size
+        versions = tuple(tiles_map.get_version((chunk_x + dx) * chunk_size, (chunk_y + dy) * chunk_size)
+                         for dy in range(-1, 2) for dx in range(-1, 2))
+        cached = solid_tiles.get((chunk_x, chunk_y))
+        if cached is not None and cached[0] == versions and None not in versions:
+            return cached
+        tile_ids, _ = tiles_map.get_region(chunk_x * chunk_size - 1, chunk_y * chunk_size - 1,
+                                           chunk_size + 2, chunk_size + 2)
+        solid = np.zeros(tile_ids.shape, dtype=bool)
+        for tile_id in SOLID_TILES:
+            solid |= tile_ids == tile_id
+        return versions, solid
+
+    def check_tile_collisions(self, entities):
+        """Same as calling check_tile_collision on every entity, but computed for all of them in one NumPy pass."""
+        if not entities:
+            return
+        tile_size = self.config.tile_size
+        chunk_size = self.config.chunk_size
+        count = len(entities)
+        positions = np.fromiter(chain.from_iterable(map(attrgetter("pos"), entities)), np.float64,
+                                2 * count).reshape(-1, 2)
+        rects = np.fromiter(chain.from_iterable(map(attrgetter("collide_rect"), entities)), np.int64,
+                            4 * count).reshape(-1, 4)
+        left, top, width, height = rects.T
+        center_x, center_y = left + width // 2, top + height // 2
+
+        # Solidity of the 3 x 3 tiles around each entity, read from the chunk it stands in and its border
+        tiles = (positions // tile_size).astype(np.int64)
+        chunks, chunk_indexes = np.unique(tiles // chunk_size, axis=0, return_inverse=True)
+        chunk_indexes = chunk_indexes.reshape(-1)
+        previous_solid_tiles = self.solid_tiles
+        self.solid_tiles = {(chunk_x, chunk_y): self.get_solid_tiles(chunk_x, chunk_y, previous_solid_tiles)
+                            for chunk_x, chunk_y in chunks.tolist()}
+        solid_tiles = np.stack([solid for _, solid in self.solid_tiles.values()])
+        local = tiles - chunks[chunk_indexes] * chunk_size + 1
+
+        # Every tile colliding with the entity sets one of its coordinates, the last one winning as in the loop
+        new_x, new_y = positions[:, 0].copy(), positions[:, 1].copy()
+        for dy in range(-1, 2):
+            for dx in range(-1, 2):
+                tile_left = (tiles[:, 0] + dx) * tile_size + tile_size // 2
+                tile_top = (tiles[:, 1] + dy) * tile_size + tile_size // 2
+                colliding = (solid_tiles[chunk_indexes, local[:, 1] + dy, local[:, 0] + dx]
+                             & (left < tile_left + tile_size) & (left + width > tile_left)
+                             & (top < tile_top + tile_size) & (top + height > tile_top))
+                dx_center = center_x - (tile_left + tile_size // 2)
+                dy_center = center_y - (tile_top + tile_size // 2)
+                horizontal = np.abs(dx_center) > np.abs(dy_center)
+                new_x = np.where(colliding & horizontal,
+                                 np.where(dx_center > 0, tile_left + tile_size + width / 2, tile_left - width / 2),
+                                 new_x)
+                new_y = np.where(colliding & ~horizontal,
+                                 np.where(dy_center > 0, tile_top + tile_size + height / 2, tile_top - height / 2),
+                                 new_y)
+
+        moved = np.flatnonzero((new_x != positions[:, 0]) | (new_y != positions[:, 1]))
+        for index, x, y in zip(moved.tolist(), new_x[moved].tolist(), new_y[moved].tolist()):
+            entities[index].pos.update(x, y)
 
     @staticmethod
     def get_collision_direction(entity_rect, tile_rect):
@@ -76,56 +176,132 @@ class EntityManager:
             return Direction.RIGHT if dx_center > 0 else Direction.LEFT
         return Direction.DOWN if dy_center > 0 else Direction.UP
 
-    def check_collision(self, entity) -> None:
-        entity_collisions = self.quadtree.intersect(entity.collide_rect)
-        for other_entity in entity_collisions:
-            if other_entity != entity and entity.collide_rect.colliderect(other_entity.collide_rect):
-                self.handle_collision(entity, other_entity)
-
-    def handle_collision(self, entity1, entity2) -> None:
-        if isinstance(entity1, Player) and isinstance(entity2, Slime):
-            # Handle collision between player and slime
-            pass
-        elif isinstance(entity2, Player) and isinstance(entity1, Slime):
-            # Handle collision between player and slime
-            pass
-        elif isinstance(entity1, Slime) and isinstance(entity2, Slime):
-            dx = entity1.pos.x - entity2.pos.x
-            dy = entity1.pos.y - entity2.pos.y
-            distance_squared = dx * dx + dy * dy
-            min_distance_squared = (entity1.width / 2 + entity2.width / 2) ** 2
-
-            if distance_squared < min_distance_squared:
-                distance = distance_squared ** 0.5
-                if distance != 0:
-                    overlap = (entity1.width / 2 + entity2.width / 2) - distance
-                    if overlap > 0:
-                        overlap_dx = (dx / distance) * overlap
-                        overlap_dy = (dy / distance) * overlap
-                        entity1.pos.x += overlap_dx
-                        entity1.pos.y += overlap_dy
-                        entity2.pos.x -= overlap_dx
-                        entity2.pos.y -= overlap_dy
+    def check_collisions(self, rect=None) -> None:
+        """Finds each colliding pair of entities once and resolves them by batch, per pair of types.
+
+        Only the entities in rect are checked if it is given.
+        """
+        pairs_by_types = defaultdict(list)
+        for entity1, entity2 in self.spatial_hash.get_overlapping_pairs(rect):
+            types = (type(entity1), type(entity2))
+            if types not in self.collision_handlers:
+                types = types[::-1]
+                entity1, entity2 = entity2, entity1
+            pairs_by_types[types].append((entity1, entity2))
+
+        for types, pairs in pairs_by_types.items():
+            handler = self.collision_handlers.get(types)
+            if handler is not None:
+                handler(pairs)
+
+    def handle_player_slime_collisions(self, pairs) -> None:
+        # Handle collision between player and slime
+        pass
+
+    def handle_slime_slime_collisions(self, pairs) -> None:
+        # Push the slimes of every pair apart by their overlap, averaging the pushes of a slime over its contacts:
+        # a slime touching a single other one moves as it did when the pairs were resolved one after another,
+        # and a slime in a crowd isn't pushed by the sum of all its overlaps at once
+        slimes = list({slime: None for pair in pairs for slime in pair})
+        indexes = {slime: index for index, slime in enumerate(slimes)}
+        first = np.array([indexes[slime1] for slime1, _ in pairs])
+        second = np.array([indexes[slime2] for _, slime2 in pairs])
+        # Pairs are sorted by spawn order, so that the sums are done in the same order in every run
+        spawn_orders = np.array([self.spawn_orders[slime] for slime in slimes])
+        swapped = spawn_orders[first] > spawn_orders[second]
+        first, second = np.where(swapped, second, first), np.where(swapped, first, second)
+        order = np.lexsort((spawn_orders[second], spawn_orders[first]))
+        first, second = first[order], second[order]
+        positions = np.array([(slime.pos.x, slime.pos.y) for slime in slimes])
+        radii = np.array([slime.width / 2 for slime in slimes])
+
+        deltas = positions[first] - positions[second]
+        distances = np.hypot(deltas[:, 0], deltas[:, 1])
+        overlaps = radii[first] + radii[second] - distances
+        colliding = (distances != 0) & (overlaps > 0)
+        pushes = deltas[colliding] / distances[colliding, None] * overlaps[colliding, None]
+
+        moves = np.zeros_like(positions)
+        np.add.at(moves, first[colliding], pushes)
+        np.add.at(moves, second[colliding], -pushes)
+        contacts = (np.bincount(first[colliding], minlength=len(slimes))
+                    + np.bincount(second[colliding], minlength=len(slimes)))
+        moves /= np.maximum(contacts, 1)[:, None]
+        for slime, (move_x, move_y) in zip(slimes, moves.tolist()):
+            slime.pos.x += move_x
+            slime.pos.y += move_y
 
     def spawn_entity(self, entity: str, pos: tuple[int, int]) -> bool:
-        if entity == "slime":
-            entity = Slime(group=self.all_sprites, pos=pos)
-            entity.target = self.player
-            self.enemies.append(entity)
-            self.quadtree.insert(item=entity, bbox=entity.collide_rect)
-            return True
-        return False
+        entity_class = self.spawnable_entities.get(entity)
+        if entity_class is None:
+            return False
+        entity = entity_class(group=self.all_sprites, pos=pos)
+        entity.target = self.player
+        self.add_enemy(entity)
+        self.spatial_hash.insert(entity, entity.collide_rect)
+        return True
 
     def get_tile_position(self, pixel_position):
         tile_x = pixel_position[0] // self.config.tile_size
         tile_y = pixel_position[1] // self.config.tile_size
         return pygame.Vector2(tile_x, tile_y)
 
+    def get_active_enemies(self, dt):
+        """Returns the (enemy, dt) of the enemies to update this tick, and the area they are in.
+
+        Enemies near the drawn area update every tick, the ones a bit farther every few ticks with a longer dt,
+        and the others sleep until the player comes near, so the cost depends on the activity around the player.
+        The slime swarm simulates every slime anyway, so every enemy updates with it.
+        """
+        if not self.config.enemy_activity_tiers or self.slime_swarm is not None:
+            return [(enemy, dt) for enemy in self.enemies], None
+
+        margin = self.config.camera_cull_margin
+        view_rect = pygame.Rect(self.player.pos.x - self.config.window_width / 2 - margin,
+                                self.player.pos.y - self.config.window_height / 2 - margin,
+                                self.config.window_width + 2 * margin, self.config.window_height + 2 * margin)
+        throttle_distance = self.config.enemy_throttle_distance
+        throttle_rect = view_rect.inflate(2 * throttle_distance, 2 * throttle_distance)
+        interval = self.config.enemy_throttle_interval
+
+        near_enemies = self.spatial_hash.query(view_rect)
+        near_enemies.discard(self.player)
+        throttled_enemies = self.spatial_hash.query(throttle_rect) - near_enemies
+        throttled_enemies.discard(self.player)
+
+        enemies = [(enemy, dt) for enemy in near_enemies]
+        # The throttled updates are spread over the ticks
+        enemies.extend((enemy, dt * interval) for enemy in throttled_enemies
+                       if (self.tick + self.spawn_orders[enemy]) % interval == 0)
+        enemies.sort(key=lambda item: self.spawn_orders[item[0]])
+        return enemies, throttle_rect
+
     def update(self, dt) -> None:
-        self.player.update(dt)
-        self.check_tile_collision(self.player)
-        self.check_collision(self.player)
-        for enemy in self.enemies:
-            enemy.update(dt)
-            self.check_tile_collision(enemy)
-            self.check_collision(enemy)
+        self.tick += 1
+        with FrameProfiler.section("entity update"):
+            self.player.update(dt)
+        with FrameProfiler.section("tile collision"):
+            self.check_tile_collision(self.player)
+        self.spatial_hash.update(self.player, self.player.collide_rect)
+
+        with FrameProfiler.section("entity update"):
+            if self.flow_field is not None:
+                self.flow_field.update(self.player.pos)
+            if self.slime_swarm is not None:
+                self.slime_swarm.update(dt)
+            active_enemies, active_rect = self.get_active_enemies(dt)
+            for enemy, enemy_dt in active_enemies:
+                if self.slime_swarm is None or enemy not in self.slime_swarm:
+                    enemy.update(enemy_dt)
+
+        with FrameProfiler.section("tile collision"):
+            if self.config.batched_tile_collisions:
+                self.check_tile_collisions([enemy for enemy, _ in active_enemies])
+            else:
+                for enemy, _ in active_enemies:
+                    self.check_tile_collision(enemy)
+
+        with FrameProfiler.section("entity collision"):
+            for enemy, _ in active_enemies:
+                self.spatial_hash.update(enemy, enemy.collide_rect)
+            self.check_collisions(active_rect)
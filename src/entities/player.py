@@ -6,6 +6,8 @@ from src.config.game_data import GameData
 from src.entities.alive_entity import AliveEntity
 from src.guis.inventory import Inventory
 
+MOVEMENT_KEYS = (pygame.K_z, pygame.K_s, pygame.K_q, pygame.K_d)  # Up, down, left and right
+
 
 class Player(AliveEntity):
     def __init__(self, group, pos):
@@ -23,6 +25,7 @@ class Player(AliveEntity):
         self.health_bar.height = 10
 
         self.teleport_pos = (0, 0)
+        self.get_pressed = get_pressed  # Source of the keys state, replaced to record or replay the input
 
         self.name = self.config.player_name
         self.assets_name = "player"
@@ -47,11 +50,8 @@ class Player(AliveEntity):
         self.inventory.add_item("carrot")
 
     def input(self):
-        keys = get_pressed()
-        up = pygame.K_z
-        down = pygame.K_s
-        left = pygame.K_q
-        right = pygame.K_d
+        keys = self.get_pressed()
+        up, down, left, right = MOVEMENT_KEYS
 
         if not self.config.Chat.chat_open:
             self.direction = Vector2(keys[right] - keys[left], keys[down] - keys[up])
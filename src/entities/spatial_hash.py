@@ -0,0 +1,98 @@
+from collections import defaultdict
+
+
+class SpatialHash:
+    """Unbounded uniform grid indexing entities by the cells their rect overlaps.
+
+    Entities are re-indexed only when they move to other cells, and removing one only touches its cells.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(set)  # (cell_x, cell_y) -> entities overlapping the cell
+        self.entity_cells = {}  # entity -> (start_x, start_y, end_x, end_y) cells range, inclusive
+        self.entity_rects = {}  # entity -> rect it was last indexed with
+
+    def __contains__(self, entity):
+        return entity in self.entity_cells
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def get_cells_range(self, rect):
+        return (int(rect[0] // self.cell_size),
+                int(rect[1] // self.cell_size),
+                int((rect[0] + rect[2]) // self.cell_size),
+                int((rect[1] + rect[3]) // self.cell_size))
+
+    def insert(self, entity, rect):
+        self.entity_rects[entity] = rect
+        self.add_to_cells(entity, self.get_cells_range(rect))
+
+    def add_to_cells(self, entity, cells_range):
+        self.entity_cells[entity] = cells_range
+        start_x, start_y, end_x, end_y = cells_range
+        for cell_y in range(start_y, end_y + 1):
+            for cell_x in range(start_x, end_x + 1):
+                self.cells[(cell_x, cell_y)].add(entity)
+
+    def remove(self, entity):
+        start_x, start_y, end_x, end_y = self.entity_cells.pop(entity)
+        self.entity_rects.pop(entity, None)
+        for cell_y in range(start_y, end_y + 1):
+            for cell_x in range(start_x, end_x + 1):
+                cell = self.cells[(cell_x, cell_y)]
+                cell.discard(entity)
+                if not cell:
+                    del self.cells[(cell_x, cell_y)]
+
+    def update(self, entity, rect):
+        """Moves the entity to the cells of its new rect, if they changed."""
+        cells_range = self.get_cells_range(rect)
+        previous_cells_range = self.entity_cells.get(entity)
+        if previous_cells_range != cells_range:
+            if previous_cells_range is not None:
+                self.remove(entity)
+            self.add_to_cells(entity, cells_range)
+        self.entity_rects[entity] = rect
+
+    def get_overlapping_pairs(self, rect=None):
+        """Returns every pair of entities whose rects overlap, once, in the cells overlapped by rect if given.
+
+        Only entities sharing a cell are tested, and a pair is kept by the single cell holding the top-left corner
+        of the overlap (the cell in the first column and row of at least one of them) instead of by every cell.
+        """
+        if rect is None:
+            cells = self.cells.items()
+        else:
+            start_x, start_y, end_x, end_y = self.get_cells_range(rect)
+            cells = [((cell_x, cell_y), self.cells[(cell_x, cell_y)])
+                     for cell_y in range(start_y, end_y + 1) for cell_x in range(start_x, end_x + 1)
+                     if (cell_x, cell_y) in self.cells]
+        pairs = []
+        for (cell_x, cell_y), cell in cells:
+            if len(cell) < 2:
+                continue
+            entities = list(cell)
+            rects = [self.entity_rects[entity] for entity in entities]
+            first_columns = [self.entity_cells[entity][0] == cell_x for entity in entities]
+            first_rows = [self.entity_cells[entity][1] == cell_y for entity in entities]
+            for index in range(len(entities) - 1):
+                first_column, first_row = first_columns[index], first_rows[index]
+                start = index + 1
+                for other_index in rects[index].collidelistall(rects[start:]):
+                    other_index += start
+                    if (first_column or first_columns[other_index]) and (first_row or first_rows[other_index]):
+                        pairs.append((entities[index], entities[other_index]))
+        return pairs
+
+    def query(self, rect):
+        """Returns the entities indexed in the cells overlapped by rect (their own rect may not overlap it)."""
+        start_x, start_y, end_x, end_y = self.get_cells_range(rect)
+        entities = set()
+        for cell_y in range(start_y, end_y + 1):
+            for cell_x in range(start_x, end_x + 1):
+                cell = self.cells.get((cell_x, cell_y))
+                if cell:
+                    entities.update(cell)
+        return entities
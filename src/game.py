@@ -6,22 +6,39 @@ from src.chat.chat_core import ChatCore
 from src.chat.chat_ui import ChatUI
 from src.map.level import Level
 from src.overlays.overlay import Overlay
+from src.utils.profiler import FrameProfiler, SessionProfiler
+from src.utils.random_streams import RandomStreams
+from src.utils.replay import InputRecorder
 
 
 class Game:
     def __init__(self):
         self.running = True
         self.config = GameData()
+        RandomStreams.reset()  # Every game starts from the same seeds
 
         self.display_surface = pygame.display.set_mode(
             (self.config.window_width, self.config.window_height),
             pygame.NOFRAME if not self.config.window_frame else False | pygame.RESIZABLE if self.config.window_resizable else False)
         pygame.display.set_caption(self.config.window_caption + " v" + self.config.game_version)
         self.clock = Clock()
+        if self.config.input_recording_path is not None:
+            # Chunks arriving late from the pool would be LOADING_TILE tiles for a number of ticks the replay,
+            # which generates them when needed, can't reproduce
+            self.config.chunk_workers = 0
+        self.accumulated_time = 0  # Time not simulated yet, less than a simulation step after an update
+        self.previous_dirty_rects = []
+        self.previous_camera_offset = None
         self.level = Level(self, self.clock)
         self.overlay = Overlay(self)
         self.chat = ChatCore(self)
         self.chat_ui = ChatUI(self.chat)
+        FrameProfiler.enabled = self.config.debug_level == 5
+        self.session_profiler = SessionProfiler(self.config.profile_sample_interval)
+        self.input_recorder = None
+        if self.config.input_recording_path is not None:
+            self.input_recorder = InputRecorder(self.config.input_recording_path)
+            self.level.player.get_pressed = self.input_recorder.wrap_get_pressed(self.level.player.get_pressed)
         self.startup()
 
     def startup(self):
@@ -36,15 +53,21 @@ class Game:
             self.render()
 
     def handle_events(self):
-        for event in pygame.event.get():
-            match event.type:
-                case pygame.QUIT:
-                    self.quit_game()
-                case pygame.KEYDOWN:
-                    self.handle_key_event(event)
-                case pygame.VIDEORESIZE:
-                    self.handle_resize_event(event)
-            self.level.handle_events(event)
+        with FrameProfiler.section("events"):
+            for event in pygame.event.get():
+                if self.input_recorder is not None:
+                    self.input_recorder.record_event(event)
+                self.handle_event(event)
+
+    def handle_event(self, event):
+        match event.type:
+            case pygame.QUIT:
+                self.quit_game()
+            case pygame.KEYDOWN:
+                self.handle_key_event(event)
+            case pygame.VIDEORESIZE:
+                self.handle_resize_event(event)
+        self.level.handle_events(event)
 
     def handle_key_event(self, event):
         if self.config.Chat.chat_open:
@@ -78,8 +101,11 @@ class Game:
 
     def handle_f3_key(self):
         self.config.debug_level += 1
-        if self.config.debug_level > 4:
+        if self.config.debug_level > 5:
             self.config.debug_level = 0
+        FrameProfiler.enabled = self.config.debug_level == 5
+        if not FrameProfiler.enabled:
+            FrameProfiler.clear()
 
     def handle_resize_event(self, event):
         self.config.window_width, self.config.window_height = event.size
@@ -88,18 +114,60 @@ class Game:
 
     def quit_game(self):
         self.running = False
+        self.level.tiles_map.close()
+        if self.session_profiler.running:
+            self.session_profiler.stop()
+        if self.input_recorder is not None:
+            self.input_recorder.close()
 
     def update(self):
         dt = self.clock.tick(self.config.max_fps) / 1000
-        self.level.update(dt)
+        # The chunks load within the time budget of a frame, however many simulation steps it runs
+        self.level.load_chunks()
+        if not self.config.simulation_rate:
+            self.step(dt)
+            self.overlay.update_texts()
+            return
+
+        # Fixed simulation steps, whatever the frame rate, and the frame is drawn between the last two steps
+        step = 1 / self.config.simulation_rate
+        self.accumulated_time += dt
+        steps = 0
+        while self.accumulated_time >= step and steps < self.config.max_simulation_steps:
+            self.step(step)
+            self.accumulated_time -= step
+            steps += 1
+        if self.accumulated_time >= step:  # Too far behind, the time left is dropped instead of slowing every frame
+            self.accumulated_time = 0
+        self.level.all_sprites.interpolation = self.accumulated_time / step
         self.overlay.update_texts()
 
+    def step(self, dt):
+        """Runs one simulation tick."""
+        self.level.all_sprites.save_positions()
+        self.level.update(dt)
+        if self.input_recorder is not None:
+            self.input_recorder.end_tick(dt)
+
     def render(self):
         self.display_surface.fill((0, 0, 0))
-        self.draw()
-        pygame.display.update()
+        dirty_rects = self.draw()
+
+        # The rects drawn in the previous frame are updated too, to erase what is no longer drawn there
+        camera_offset = self.level.all_sprites.offset
+        if self.config.dirty_rects_rendering and camera_offset == self.previous_camera_offset:
+            pygame.display.update(dirty_rects + self.previous_dirty_rects)
+        else:
+            pygame.display.update()
+        self.previous_dirty_rects = dirty_rects
+        self.previous_camera_offset = camera_offset.copy()
+        FrameProfiler.end_frame()
+        self.session_profiler.end_frame()
 
     def draw(self):
-        self.level.draw()
-        self.chat_ui.draw()
-        self.overlay.draw()
\ No newline at end of file
+        """Draws the game and returns the rects that changed since the last frame."""
+        dirty_rects = self.level.draw()
+        with FrameProfiler.section("UI draw"):
+            dirty_rects += self.chat_ui.draw()
+            dirty_rects += self.overlay.draw()
+        return dirty_rects
\ No newline at end of file
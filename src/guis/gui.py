@@ -2,6 +2,7 @@ import pygame
 from pygame import Vector2, Surface, SRCALPHA
 from src.config.game_data import GameData
 from src.utils.colors import Color
+from src.utils.profiler import FrameProfiler
 
 
 class InventoryUI:
@@ -57,6 +58,7 @@ class InventoryUI:
                             self.inventory.hand_inventory = None
 
     def draw(self):
+        """Draws the inventory and returns the rects drawn."""
         self.inventory_pos = Vector2(self.config.window_width * 0.766 - self.surface.get_width() // 2,
                                      self.config.window_height // 2 - self.surface.get_height() // 2)
         # Create a new surface for the inventory image
@@ -68,18 +70,24 @@ class InventoryUI:
                 x = col * self.config.player_inventory_slot_size
                 y = row * self.config.player_inventory_slot_size
                 inventory_image.blit(self.inventory_slot_image, (x, y))
+                FrameProfiler.count("blits")
                 if tile.image:
                     inventory_image.blit(tile.image.value, (x, y))
+                    FrameProfiler.count("blits")
 
         # Blit the inventory_image onto self.surface
         self.surface.blit(inventory_image, (0, 0))
 
         # Blit self.surface onto display_surface
-        self.display_surface.blit(self.surface, self.inventory_pos)
+        dirty_rects = [self.display_surface.blit(self.surface, self.inventory_pos)]
+        FrameProfiler.count("blits", 2)
 
         # Draw the hand surface
         hand_surface = self.get_hand_surface()
         if hand_surface:
             mouse_pos = pygame.mouse.get_pos()
             image_rect = hand_surface.get_rect(center=mouse_pos)
-            self.display_surface.blit(hand_surface, image_rect)
+            dirty_rects.append(self.display_surface.blit(hand_surface, image_rect))
+            FrameProfiler.count("blits", 2)  # With the one into hand_surface
+
+        return dirty_rects
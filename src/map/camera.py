@@ -1,11 +1,13 @@
+from operator import attrgetter
+
 from pygame import display, draw
-from pygame import Vector2
+from pygame import Rect, Vector2
 from pygame.sprite import Group
 from pygame.freetype import Font
 
 from src.config.game_data import GameData
 from src.utils.colors import Color
-from src.utils.utils import draw_formatted_message, format_text
+from src.utils.profiler import FrameProfiler
 
 
 class Camera(Group):
@@ -15,12 +17,50 @@ class Camera(Group):
         self.display_surface = display.get_surface()
         self.offset = Vector2()
         self.font = Font("assets/fonts/LycheeSoda.ttf", self.config.Chat.font_size)
+        self.spatial_index = None  # Index of the sprites positions, every sprite is drawn without it
+        self.sorted_sprites = []  # Sprites drawn in the last frame, sorted by y
+        self.previous_positions = {}  # Sprite -> position before the last simulation step
+        self.interpolation = 1  # Progress of the frame between the previous and current positions
+
+    def get_visible_sprites(self):
+        """Returns the sprites near the window, sorted by y.
+
+        The order of the last frame is reused, so sorting is almost free when the sprites barely moved.
+        """
+        if self.spatial_index is None:
+            self.sorted_sprites = sorted(self.sprites(), key=attrgetter("pos.y"))
+            return self.sorted_sprites
+
+        margin = self.config.camera_cull_margin
+        view_rect = Rect(self.offset.x - margin, self.offset.y - margin,
+                         self.config.window_width + 2 * margin, self.config.window_height + 2 * margin)
+        visible_sprites = {sprite for sprite in self.spatial_index.query(view_rect) if sprite in self.spritedict}
+
+        sprites_sorted = [sprite for sprite in self.sorted_sprites if sprite in visible_sprites]
+        sprites_sorted.extend(visible_sprites.difference(sprites_sorted))
+        sprites_sorted.sort(key=attrgetter("pos.y"))
+        self.sorted_sprites = sprites_sorted
+        return sprites_sorted
+
+    def save_positions(self):
+        """Keeps the positions of the sprites drawn in the last frame before a simulation step."""
+        self.previous_positions = {sprite: sprite.pos.copy() for sprite in self.sorted_sprites}
+
+    def get_draw_pos(self, sprite):
+        """Returns the position of the sprite interpolated between the last two simulation steps."""
+        previous_pos = self.previous_positions.get(sprite)
+        if previous_pos is None or self.interpolation >= 1:
+            return sprite.pos.copy()
+        if previous_pos.distance_squared_to(sprite.pos) > self.config.tile_size ** 2:  # Teleported
+            return sprite.pos.copy()
+        return previous_pos.lerp(sprite.pos, self.interpolation)
 
     def shifted_draw(self, player):
-        self.offset = player.pos - Vector2(self.config.window_width / 2, self.config.window_height / 2)
-        sprites_sorted = sorted(self.sprites(), key=lambda sprite: sprite.pos.y)
-        for sprite in sprites_sorted:
-            offset_pos = sprite.pos.copy()
+        """Draws the sprites around the player and returns the rects drawn."""
+        self.offset = self.get_draw_pos(player) - Vector2(self.config.window_width / 2, self.config.window_height / 2)
+        dirty_rects = []
+        for sprite in self.get_visible_sprites():
+            offset_pos = self.get_draw_pos(sprite)
             offset_pos -= self.offset
             image_width = sprite.image.get_width()
             image_height = sprite.image.get_height()
@@ -28,55 +68,54 @@ class Camera(Group):
             hitbox_shape = sprite.collide_rect.width, sprite.collide_rect.height
             centered_pos = Vector2(offset_pos.x - image_width / 2 + sprite.image_offset.x,
                                    offset_pos.y - image_height / 2 + sprite.image_offset.y)
-            self.display_surface.blit(sprite.image, centered_pos)
-
-            sprite.health_bar.get_surface()
+            dirty_rects.append(self.display_surface.blit(sprite.image, centered_pos))
+            FrameProfiler.count("blits")
 
             # Draw health bar
-            health_bar_surface = sprite.health_bar.get_surface()  # Assuming health_bar has a get_surface method
+            health_bar_surface = sprite.health_bar.get_surface()
             health_bar_width = health_bar_surface.get_width()
             health_bar_height = health_bar_surface.get_height()
             health_bar_pos = (offset_pos.x - health_bar_width / 2 + sprite.health_bar.offset.x,
                               offset_pos.y - health_bar_height / 2 - image_height / 2 + sprite.health_bar.offset.y)
-            self.display_surface.blit(health_bar_surface, health_bar_pos)
+            dirty_rects.append(self.display_surface.blit(health_bar_surface, health_bar_pos))
+            FrameProfiler.count("blits")
 
             if sprite.name:
-                formatted_message = format_text(sprite.name)
-
-                # Calculate total width and height of the formatted text
-                total_text_width = sum(self.font.get_rect(text).width for text, _ in formatted_message)
-                total_text_height = sum(self.font.get_rect(text).height for text, _ in formatted_message)
+                name_surface = sprite.nameplate.get_surface(self.font)
+                total_text_width, total_text_height = sprite.nameplate.text_size
 
                 # Center the text on both x and y axes
                 text_pos = (offset_pos.x - total_text_width / 2 + sprite.name_offset.x,
                             offset_pos.y - total_text_height / 2 + sprite.name_offset.y)
 
-                draw_formatted_message(font=self.font,
-                                       surface=self.display_surface,
-                                       formatted_message=formatted_message,
-                                       pos=text_pos)
+                dirty_rects.append(self.display_surface.blit(name_surface, text_pos))
+                FrameProfiler.count("blits")
 
             if self.config.debug_level == 2 or self.config.debug_level == 4:
-                self.draw_debug_squares(sprite, offset_pos, image_shape, hitbox_shape)
+                dirty_rects.extend(self.draw_debug_squares(sprite, offset_pos, image_shape, hitbox_shape))
+
+        return dirty_rects
 
     def draw_debug_squares(self, sprite, offset_pos, image_shape, hitbox_shape):
         image_width, image_height = image_shape
         hitbox_width, hitbox_height = hitbox_shape
 
         # Draw the image rectangle
-        draw.rect(self.display_surface,
-                  Color.DARK_GREEN,
-                  (offset_pos.x - image_width / 2 + sprite.image_offset.x,
-                   offset_pos.y - image_height / 2 + sprite.image_offset.y,
-                   image_width,
-                   image_height),
-                  width=1)
+        image_rect = draw.rect(self.display_surface,
+                               Color.DARK_GREEN,
+                               (offset_pos.x - image_width / 2 + sprite.image_offset.x,
+                                offset_pos.y - image_height / 2 + sprite.image_offset.y,
+                                image_width,
+                                image_height),
+                               width=1)
 
         # Draw the hitbox rectangle
-        draw.rect(self.display_surface,
-                  Color.DARK_RED,
-                  (offset_pos.x - hitbox_width / 2,
-                   offset_pos.y - hitbox_height / 2,
-                   hitbox_width,
-                   hitbox_height),
-                  width=1)
+        hitbox_rect = draw.rect(self.display_surface,
+                                Color.DARK_RED,
+                                (offset_pos.x - hitbox_width / 2,
+                                 offset_pos.y - hitbox_height / 2,
+                                 hitbox_width,
+                                 hitbox_height),
+                                width=1)
+
+        return image_rect, hitbox_rect
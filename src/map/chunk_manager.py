@@ -0,0 +1,201 @@
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from queue import Empty, SimpleQueue
+from time import perf_counter
+
+import numpy as np
+
+from src.config.game_data import GameData
+from src.map.tile_map import EMPTY_TILE, LOADING_TILE, Tile
+
+worker_generator = None  # Tile map generator of a chunk generation process
+
+
+def init_worker(tile_map_generator):
+    global worker_generator
+    worker_generator = tile_map_generator
+
+
+def generate_chunk_in_worker(chunk_x, chunk_y):
+    return worker_generator.generate_chunk(chunk_x, chunk_y)
+
+
+class ChunkManager:
+    """Endless tile map made of chunks generated on demand.
+
+    The chunks are generated by a pool of ``GameData.chunk_workers`` processes (or on the main thread if it
+    is 0) and handed back through a queue drained by ``update``, so reading a chunk that is not generated yet
+    never blocks: it is seen as LOADING_TILE tiles until its data arrives. A chunk whose worker failed is
+    generated on the main thread instead, and the pool is dropped if a worker died.
+
+    The loaded chunks are kept in a LRU cache bounded by ``GameData.chunk_cache_memory``, the chunks around
+    the camera being refreshed every frame so that only the far ones get evicted. The tiles changed by ``set``
+    are kept apart and applied again when their chunk is generated again, its version still increasing.
+    It has the same interface as ``TileMap``.
+    """
+
+    def __init__(self, tile_map_generator):
+        self.config = GameData()
+        self.tile_map_generator = tile_map_generator
+        self.chunk_size = self.config.chunk_size
+        self.chunks = OrderedDict()  # (chunk_x, chunk_y) -> TileMap, least recently used first
+        self.edits = {}  # (chunk_x, chunk_y) -> {(x, y): (tile_id, variant)} of the tiles changed by set
+        self.evicted_versions = {}  # (chunk_x, chunk_y) -> version of the changed chunks when they were evicted
+
+        chunk_memory = 2 * self.chunk_size * self.chunk_size  # uint8 tile ids and variants
+        self.max_chunks = max(self.config.chunk_cache_memory // chunk_memory, len(self.get_chunks_around((0, 0))))
+
+        self.pool = None
+        if self.config.chunk_workers > 0:
+            self.pool = ProcessPoolExecutor(max_workers=self.config.chunk_workers,
+                                            initializer=init_worker,
+                                            initargs=(tile_map_generator,))
+        self.pending_chunks = {}  # (chunk_x, chunk_y) -> Future
+        self.generated_chunks = SimpleQueue()  # (chunk_x, chunk_y) of the finished futures
+
+    def __contains__(self, pos):
+        return self.get(*pos) is not None
+
+    def __getitem__(self, pos):
+        """Compatibility accessor returning a ``Tile``, as the former dict of tiles did."""
+        x, y = int(pos[0]), int(pos[1])
+        chunk = self.get_chunk(x // self.chunk_size, y // self.chunk_size, wait=True)
+        tile_id = chunk.get(x, y)
+        if tile_id is None:
+            raise KeyError(pos)
+        return Tile(tile_id, x, y, int(chunk.variants[y - chunk.origin_y, x - chunk.origin_x]))
+
+    def add_chunk(self, key, chunk):
+        edits = self.edits.get(key)
+        if edits:
+            for (x, y), (tile_id, variant) in edits.items():
+                chunk.set(x, y, tile_id, variant)
+            chunk.version = self.evicted_versions.pop(key, 0) + 1
+        self.chunks[key] = chunk
+        while len(self.chunks) > self.max_chunks:
+            evicted_key, evicted_chunk = self.chunks.popitem(last=False)
+            if evicted_chunk.version:
+                self.evicted_versions[evicted_key] = evicted_chunk.version
+
+    def get_chunk(self, chunk_x, chunk_y, wait=False):
+        """Returns the chunk (chunk_x, chunk_y).
+
+        If it is not loaded, its generation is requested and None is returned, unless wait is True.
+        """
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        if self.pool is None or (wait and key not in self.pending_chunks):
+            chunk = self.tile_map_generator.generate_chunk(chunk_x, chunk_y)
+        elif wait:
+            chunk = self.get_result(key, self.pending_chunks.pop(key))
+        else:
+            if key not in self.pending_chunks:
+                future = self.pool.submit(generate_chunk_in_worker, chunk_x, chunk_y)
+                future.add_done_callback(lambda _: self.generated_chunks.put(key))
+                self.pending_chunks[key] = future
+            return None
+
+        self.add_chunk(key, chunk)
+        return chunk
+
+    def update(self):
+        """Loads the generated chunks, within the time budget of a frame."""
+        deadline = perf_counter() + self.config.chunk_load_time_budget
+        while perf_counter() < deadline:
+            try:
+                key = self.generated_chunks.get_nowait()
+            except Empty:
+                break
+            future = self.pending_chunks.pop(key, None)
+            if future is not None:  # Otherwise it was already waited for
+                self.add_chunk(key, self.get_result(key, future))
+
+    def get_result(self, key, future):
+        """Returns the chunk generated by the future, or generates it on the main thread if its worker failed."""
+        try:
+            return future.result()
+        except Exception as error:  # pylint:disable=W0718
+            traceback.print_exception(error)
+            if isinstance(error, BrokenProcessPool) and self.pool is not None:
+                # The other pending chunks fail the same way and are generated here as they come
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = None
+            return self.tile_map_generator.generate_chunk(*key)
+
+    def get(self, x, y):
+        """Returns the tile id at (x, y), or None if there is no tile (or it is still being generated)."""
+        x, y = int(x), int(y)
+        chunk = self.get_chunk(x // self.chunk_size, y // self.chunk_size)
+        if chunk is None:
+            return None
+        return chunk.get(x, y)
+
+    def set(self, x, y, tile_id, variant=1):
+        x, y = int(x), int(y)
+        key = (x // self.chunk_size, y // self.chunk_size)
+        self.get_chunk(*key, wait=True).set(x, y, tile_id, variant)
+        self.edits.setdefault(key, {})[(x, y)] = (tile_id, variant)
+
+    def get_version(self, x, y):
+        """Returns a number that changes whenever a tile of the chunk holding (x, y) changes.
+
+        It is None while the chunk is not loaded, and the chunk is not requested nor marked as used.
+        """
+        chunk = self.chunks.get((int(x) // self.chunk_size, int(y) // self.chunk_size))
+        if chunk is None:
+            return None
+        return chunk.version
+
+    def get_region(self, x, y, w, h, wait=False):
+        """Returns copies of the tile ids and variants of the w x h area starting at (x, y).
+
+        The tiles of the chunks still being generated are LOADING_TILE, unless wait is True.
+        """
+        tile_ids = np.full((h, w), EMPTY_TILE, dtype=np.uint8)
+        variants = np.ones((h, w), dtype=np.uint8)
+        for chunk_y in range(y // self.chunk_size, (y + h - 1) // self.chunk_size + 1):
+            for chunk_x in range(x // self.chunk_size, (x + w - 1) // self.chunk_size + 1):
+                chunk = self.get_chunk(chunk_x, chunk_y, wait)
+                origin_x, origin_y = chunk_x * self.chunk_size, chunk_y * self.chunk_size
+                start_x, end_x = max(x, origin_x), min(x + w, origin_x + self.chunk_size)
+                start_y, end_y = max(y, origin_y), min(y + h, origin_y + self.chunk_size)
+                target = (slice(start_y - y, end_y - y), slice(start_x - x, end_x - x))
+                if chunk is None:
+                    tile_ids[target] = LOADING_TILE
+                    continue
+                source = (slice(start_y - origin_y, end_y - origin_y), slice(start_x - origin_x, end_x - origin_x))
+                tile_ids[target] = chunk.tile_ids[source]
+                variants[target] = chunk.variants[source]
+        return tile_ids, variants
+
+    def get_positions(self, tile_id, x, y, w, h):
+        """Returns the (x, y) positions of every tile with the given id in the given area."""
+        tile_ids, _ = self.get_region(x, y, w, h, wait=True)
+        return [(int(column) + x, int(row) + y) for row, column in np.argwhere(tile_ids == tile_id)]
+
+    def get_chunks_around(self, pixel_position):
+        """Returns the keys of the chunks seen by a camera centered on pixel_position, plus the prefetched rings."""
+        chunk_pixel_size = self.chunk_size * self.config.tile_size
+        distance = self.config.chunk_prefetch_distance
+        start_x = int((pixel_position[0] - self.config.window_width / 2) // chunk_pixel_size) - distance
+        end_x = int((pixel_position[0] + self.config.window_width / 2) // chunk_pixel_size) + distance
+        start_y = int((pixel_position[1] - self.config.window_height / 2) // chunk_pixel_size) - distance
+        end_y = int((pixel_position[1] + self.config.window_height / 2) // chunk_pixel_size) + distance
+        return [(chunk_x, chunk_y) for chunk_y in range(start_y, end_y + 1) for chunk_x in range(start_x, end_x + 1)]
+
+    def load_around(self, pixel_position, wait=False):
+        """Requests the chunks around pixel_position and marks them as the most recently used."""
+        chunks_around = self.get_chunks_around(pixel_position)
+        self.max_chunks = max(self.max_chunks, len(chunks_around))  # The window may have been resized
+        for chunk_x, chunk_y in chunks_around:
+            self.get_chunk(chunk_x, chunk_y, wait)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
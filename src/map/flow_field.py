@@ -0,0 +1,121 @@
+import heapq
+import math
+
+import numpy as np
+from pygame import Vector2
+
+from src.config.game_data import GameData
+from src.map.tile_map import SOLID_TILES
+
+# Neighbours of a tile with the cost of moving to them, diagonals last
+NEIGHBOURS = ((1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1),
+              (1, 1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, -1, math.sqrt(2)))
+
+
+class FlowField:
+    """Paths from every walkable tile around the player to the player, shared by all the enemies.
+
+    A Dijkstra pass over the tiles in radius gives each tile the next tile of its shortest path to the player.
+    It only runs again when the player changes tile or the chunks around change, and the enemies just read it.
+    Tiles are placed half a tile away from their position, as the collisions consider them.
+    """
+
+    def __init__(self, tiles_map, radius):
+        self.config = GameData()
+        self.tiles_map = tiles_map
+        self.radius = radius
+        self.origin_x = self.origin_y = 0  # Tile at [0, 0] of the arrays
+        self.next_tiles = np.zeros((0, 0, 2), dtype=np.int64)  # [row, column] -> next (x, y) tile
+        self.has_path = np.zeros((0, 0), dtype=bool)  # [row, column] -> whether next_tiles holds a tile there
+        self.key = None  # Player tile and chunks versions the paths were computed for
+
+    def get_tile(self, x, y):
+        """Returns the tile under the pixel position."""
+        tile_size = self.config.tile_size
+        return math.floor((x - tile_size / 2) / tile_size), math.floor((y - tile_size / 2) / tile_size)
+
+    def update(self, pixel_pos):
+        """Computes the paths to the player again if the player changed tile or the tiles around changed."""
+        player_x, player_y = self.get_tile(pixel_pos[0], pixel_pos[1])
+        size = 2 * self.radius + 1
+        start_x, start_y = player_x - self.radius, player_y - self.radius
+        chunk_size = self.config.chunk_size
+        versions = tuple(self.tiles_map.get_version(chunk_x * chunk_size, chunk_y * chunk_size)
+                         for chunk_y in range(start_y // chunk_size, (start_y + size - 1) // chunk_size + 1)
+                         for chunk_x in range(start_x // chunk_size, (start_x + size - 1) // chunk_size + 1))
+        key = (player_x, player_y, versions)
+        if key == self.key:
+            return False
+        self.key = key
+        tile_ids, _ = self.tiles_map.get_region(start_x, start_y, size, size)
+        self.compute(~np.isin(tile_ids, SOLID_TILES), start_x, start_y)
+        return True
+
+    def compute(self, walkable, start_x, start_y):
+        """Runs the Dijkstra pass from the player, at the center of the walkable grid."""
+        size = walkable.shape[0]
+        self.origin_x, self.origin_y = start_x, start_y
+        self.next_tiles = np.zeros((size, size, 2), dtype=np.int64)
+        self.has_path = np.zeros((size, size), dtype=bool)
+        walkable = walkable.tolist()
+        distances = [[math.inf] * size for _ in range(size)]
+        next_tiles = [[None] * size for _ in range(size)]
+
+        distances[self.radius][self.radius] = 0
+        queue = [(0, self.radius, self.radius)]
+        while queue:
+            distance, column, row = heapq.heappop(queue)
+            if distance > distances[row][column]:
+                continue
+            for dx, dy, cost in NEIGHBOURS:
+                other_column, other_row = column + dx, row + dy
+                if not (0 <= other_column < size and 0 <= other_row < size and walkable[other_row][other_column]):
+                    continue
+                # No corner cutting: a diagonal needs both tiles beside it to be walkable
+                if dx and dy and not (walkable[row][other_column] and walkable[other_row][column]):
+                    continue
+                other_distance = distance + cost
+                if other_distance < distances[other_row][other_column]:
+                    distances[other_row][other_column] = other_distance
+                    next_tiles[other_row][other_column] = (column + start_x, row + start_y)
+                    heapq.heappush(queue, (other_distance, other_column, other_row))
+
+        for row, tiles_row in enumerate(next_tiles):
+            for column, next_tile in enumerate(tiles_row):
+                if next_tile is not None:
+                    self.next_tiles[row, column] = next_tile
+                    self.has_path[row, column] = True
+
+    def get_direction(self, pos):
+        """Returns the normalized direction from pos to the center of the next tile of its path, or None."""
+        tile_x, tile_y = self.get_tile(pos.x, pos.y)
+        column, row = tile_x - self.origin_x, tile_y - self.origin_y
+        if not (0 <= column < self.has_path.shape[1] and 0 <= row < self.has_path.shape[0]):
+            return None
+        if not self.has_path[row, column]:
+            return None
+        next_x, next_y = self.next_tiles[row, column].tolist()
+        # The center of a tile is a whole tile away from its position
+        direction = Vector2((next_x + 1) * self.config.tile_size - pos.x, (next_y + 1) * self.config.tile_size - pos.y)
+        if direction.length_squared() == 0:
+            return None
+        return direction.normalize()
+
+    def get_directions(self, positions):
+        """Same as get_direction for an (n, 2) array of positions, rows without a path being NaN."""
+        tile_size = self.config.tile_size
+        tiles = np.floor((positions - tile_size / 2) / tile_size).astype(np.int64)
+        columns, rows = tiles[:, 0] - self.origin_x, tiles[:, 1] - self.origin_y
+        height, width = self.has_path.shape
+        inside = (columns >= 0) & (columns < width) & (rows >= 0) & (rows < height)
+        next_tiles = np.zeros(positions.shape, dtype=np.int64)
+        next_tiles[inside] = self.next_tiles[rows[inside], columns[inside]]
+        has_path = np.zeros(len(positions), dtype=bool)
+        has_path[inside] = self.has_path[rows[inside], columns[inside]]
+
+        deltas = (next_tiles + 1) * tile_size - positions
+        lengths = np.sqrt(deltas[:, 0] * deltas[:, 0] + deltas[:, 1] * deltas[:, 1])
+        has_path &= lengths != 0
+        directions = np.full(positions.shape, np.nan)
+        directions[has_path] = deltas[has_path] / lengths[has_path, None]
+        return directions
@@ -5,9 +5,11 @@ from src.entities.entity_manager import EntityManager
 from src.entities.player import Player
 from src.guis.gui import InventoryUI
 from src.map.camera import Camera
+from src.map.chunk_manager import ChunkManager
 from src.map.map_render import MapRender
 from src.map.mini_map import MiniMap
 from src.map.tile_map import NoiseTileMapGenerator
+from src.utils.profiler import FrameProfiler
 
 
 class Level:
@@ -20,20 +22,19 @@ class Level:
         self.all_sprites = Camera()
 
         self.tile_map_generator = NoiseTileMapGenerator(self)
-        self.tiles_map = self.tile_map_generator.generate_tiles_map(
-            0,
-            0,
-            self.config.map_size,
-            self.config.map_size)
+        self.tiles_map = ChunkManager(self.tile_map_generator)
+        self.tile_map_generator.tiles_map = self.tiles_map
         self.map_render = MapRender(self)
         self.map_render.load_tile_images()
 
         # Player creation
         self.player = Player(group=self.all_sprites, pos=(-6, -16))
+        self.tiles_map.load_around(self.player.pos, wait=True)
         self.inventory_ui = InventoryUI(self.player.inventory)
 
         # EntityManager initialization
         self.entity_manager = EntityManager(self.config, self.player, self.all_sprites, self.tile_map_generator)
+        self.all_sprites.spatial_index = self.entity_manager.spatial_hash
 
         self.mini_map = MiniMap(tiles_map=self.tiles_map,
                                 mini_map_size=20,
@@ -41,14 +42,28 @@ class Level:
                                 visible_area_size=20)
         self.uis = [self.inventory_ui]
 
-    def draw(self) -> None:
-        self.map_render.draw_map()
-        self.all_sprites.shifted_draw(self.player)
+    def draw(self) -> list:
+        """Draws the level and returns the rects that changed since the last frame."""
+        with FrameProfiler.section("map draw"):
+            dirty_rects = self.map_render.draw_map()
+        with FrameProfiler.section("sprite draw"):
+            dirty_rects += self.all_sprites.shifted_draw(self.player)
         if self.config.show_player_inventory:
-            for ui in self.uis:
-                ui.draw()
+            with FrameProfiler.section("UI draw"):
+                for ui in self.uis:
+                    dirty_rects += ui.draw()
+        return dirty_rects
+
+    def load_chunks(self) -> None:
+        """Loads the chunks generated by the pool and requests the ones around the player, once per frame."""
+        self.tiles_map.update()
+        if self.tiles_map.pool is not None:
+            self.tiles_map.load_around(self.player.pos)
 
     def update(self, dt) -> None:
+        if self.tiles_map.pool is None:
+            # Generated on the main thread, the chunks are loaded at the ticks needing them, as in a replay
+            self.tiles_map.load_around(self.player.pos)
         self.entity_manager.update(dt)
 
     def handle_events(self, event) -> None:
@@ -59,4 +74,5 @@ class Level:
     def teleport_player(self, pos) -> None:
         x, y = pos
         pixel_x, pixel_y = x * self.config.tile_size, y * self.config.tile_size
+        self.tiles_map.load_around((pixel_x, pixel_y))
         self.player.pos = pygame.Vector2(pixel_x, pixel_y)
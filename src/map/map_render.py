@@ -1,7 +1,9 @@
 import pygame
 
 from src.config.game_data import GameData
+from src.map.tile_map import EMPTY_TILE, LOADING_TILE
 from src.utils.colors import Color
+from src.utils.profiler import FrameProfiler
 
 
 class MapRender:
@@ -9,6 +11,7 @@ class MapRender:
         self.tile_images = None
         self.config = GameData()
         self.level = level
+        self.chunk_surfaces = {}  # (chunk_x, chunk_y) -> (tiles version, pre-rendered Surface)
     
     def load_tile_images(self) -> None:
         self.tile_images = {
@@ -19,27 +22,88 @@ class MapRender:
         for key, image in self.tile_images.items():
             self.tile_images[key] = pygame.transform.scale(image, (
                 image.get_width() * self.config.tile_scale, image.get_height() * self.config.tile_scale))
+        self.chunk_surfaces.clear()
 
-    def draw_map(self) -> None:
-        visible_tiles = self.level.tile_map_generator.get_visible_tiles()
-        for tile in visible_tiles:
-            tile_id = tile.tile_id
-            if tile_id in self.tile_images:
-                tile_image = self.tile_images[tile_id]
-                tile_x = ((tile.pos.x * self.config.tile_size + self.config.tile_size / 2)
-                          - self.level.player.pos.x + self.config.window_width // 2)
-                tile_y = ((tile.pos.y * self.config.tile_size + self.config.tile_size / 2)
-                          - self.level.player.pos.y + self.config.window_height // 2)
-                self.level.display_surface.blit(tile_image, (tile_x, tile_y))
-                if self.config.debug_level == 3 or self.config.debug_level == 4:
-                    pygame.draw.rect(self.level.display_surface, Color.DARK_BLUE,
-                                     (tile_x,
-                                      tile_y,
-                                      self.config.tile_size,
-                                      self.config.tile_size), 1)
-            else:
-                pygame.draw.rect(self.level.display_surface, Color.WHITE,
-                                 (tile.pos.x * self.config.tile_size, tile.pos.y * self.config.tile_size,
-                                  self.config.tile_size,
-                                  self.config.tile_size))
-                
\ No newline at end of file
+    def render_chunk(self, x, y):
+        """Renders the render_chunk_size x render_chunk_size tiles starting at (x, y) into a new surface."""
+        chunk_size = self.config.render_chunk_size
+        tile_size = self.config.tile_size
+        surface = pygame.Surface((chunk_size * tile_size, chunk_size * tile_size)).convert()
+        FrameProfiler.count("surfaces")
+        tile_ids, _ = self.level.tiles_map.get_region(x, y, chunk_size, chunk_size)
+        for row, tile_row in enumerate(tile_ids.tolist()):
+            for column, tile_id in enumerate(tile_row):
+                if tile_id == EMPTY_TILE:
+                    continue
+                tile_rect = (column * tile_size, row * tile_size, tile_size, tile_size)
+                if tile_id in self.tile_images:
+                    surface.blit(self.tile_images[tile_id], tile_rect)
+                elif tile_id == LOADING_TILE:  # Placeholder until the chunk is generated
+                    pygame.draw.rect(surface, Color.DARK_GRAY, tile_rect)
+                else:
+                    pygame.draw.rect(surface, Color.WHITE, tile_rect)
+        return surface
+
+    def get_chunk_surface(self, chunk_x, chunk_y):
+        """Returns the pre-rendered surface of a chunk, rendering it again only if one of its tiles changed.
+
+        The second returned value tells whether the surface was just rendered.
+        """
+        chunk_size = self.config.render_chunk_size
+        x, y = chunk_x * chunk_size, chunk_y * chunk_size
+        version = self.level.tiles_map.get_version(x, y)
+        cached = self.chunk_surfaces.get((chunk_x, chunk_y))
+        if cached is not None and cached[0] == version:
+            return cached[1], False
+        surface = self.render_chunk(x, y)
+        self.chunk_surfaces[(chunk_x, chunk_y)] = (version, surface)
+        return surface, True
+
+    def draw_map(self) -> list:
+        """Draws the visible part of the map and returns the rects that changed since the last frame."""
+        chunk_pixel_size = self.config.render_chunk_size * self.config.tile_size
+        player_pos = self.level.all_sprites.get_draw_pos(self.level.player)
+        # Tiles are drawn half a tile away from their position, as the collisions consider them
+        offset_x = player_pos.x - self.config.window_width // 2 - self.config.tile_size / 2
+        offset_y = player_pos.y - self.config.window_height // 2 - self.config.tile_size / 2
+        start_x, end_x = int(offset_x // chunk_pixel_size), int((offset_x + self.config.window_width) // chunk_pixel_size)
+        start_y, end_y = int(offset_y // chunk_pixel_size), int((offset_y + self.config.window_height) // chunk_pixel_size)
+
+        dirty_rects = []
+        visible_chunks = set()
+        for chunk_y in range(start_y, end_y + 1):
+            for chunk_x in range(start_x, end_x + 1):
+                visible_chunks.add((chunk_x, chunk_y))
+                surface, rendered = self.get_chunk_surface(chunk_x, chunk_y)
+                chunk_rect = self.level.display_surface.blit(surface, (chunk_x * chunk_pixel_size - offset_x,
+                                                                       chunk_y * chunk_pixel_size - offset_y))
+                FrameProfiler.count("blits")
+                if rendered:
+                    dirty_rects.append(chunk_rect)
+
+        # Off screen chunks are rendered again when they come back into view
+        for key in self.chunk_surfaces.keys() - visible_chunks:
+            del self.chunk_surfaces[key]
+
+        if self.config.debug_level == 3 or self.config.debug_level == 4:
+            dirty_rects.extend(self.draw_debug_squares())
+
+        return dirty_rects
+
+    def draw_debug_squares(self):
+        dirty_rects = []
+        player_pos = self.level.all_sprites.get_draw_pos(self.level.player)
+        start_x, start_y, tile_ids = self.level.tile_map_generator.get_visible_tiles()
+        for row, tile_row in enumerate(tile_ids.tolist()):
+            for column, tile_id in enumerate(tile_row):
+                if tile_id in self.tile_images:
+                    tile_x = (((start_x + column) * self.config.tile_size + self.config.tile_size / 2)
+                              - player_pos.x + self.config.window_width // 2)
+                    tile_y = (((start_y + row) * self.config.tile_size + self.config.tile_size / 2)
+                              - player_pos.y + self.config.window_height // 2)
+                    dirty_rects.append(pygame.draw.rect(self.level.display_surface, Color.DARK_BLUE,
+                                                        (tile_x,
+                                                         tile_y,
+                                                         self.config.tile_size,
+                                                         self.config.tile_size), 1))
+        return dirty_rects
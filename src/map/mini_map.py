@@ -1,10 +1,13 @@
+import numpy as np
 import pygame
 
+from src.config.game_data import GameData
 from src.utils.colors import Color
 
 
 class MiniMap:
     def __init__(self, tiles_map, mini_map_size, display_surface, visible_area_size):
+        self.config = GameData()
         self.tiles_map = tiles_map
         self.mini_map_size = mini_map_size
         self.display_surface = display_surface
@@ -14,20 +17,25 @@ class MiniMap:
             1: Color.DARK_RED,
             2: Color.DARK_BLUE
         }
+        self.palette = np.zeros((256, 3), dtype=np.uint8)  # Tile id -> color, unknown tiles are black
+        for tile_id, color in self.colors.items():
+            self.palette[tile_id] = color
 
     def draw(self, player_position):
-        mini_map_surface = pygame.Surface(self.mini_map_size)
-        for (x, y), tile in self.tiles_map.items():
-            rect = pygame.Rect(x * self.mini_map_size[0] / len(self.tiles_map),
-                               y * self.mini_map_size[1] / len(self.tiles_map),
-                               self.mini_map_size[0] / len(self.tiles_map),
-                               self.mini_map_size[1] / len(self.tiles_map))
-            pygame.draw.rect(mini_map_surface, self.colors[tile.tile_id], rect)
+        # The mini map shows the map_size x map_size tiles around the player
+        area_size = self.config.map_size
+        area_x = int(player_position.x - area_size / 2)
+        area_y = int(player_position.y - area_size / 2)
+        tile_ids, _ = self.tiles_map.get_region(area_x, area_y, area_size, area_size)
+        tiles_surface = pygame.surfarray.make_surface(self.palette[tile_ids].swapaxes(0, 1))
+        mini_map_surface = pygame.transform.scale(tiles_surface, self.mini_map_size)
 
-        visible_area_rect = pygame.Rect(player_position.x * self.mini_map_size[0] / len(self.tiles_map),
-                                        player_position.y * self.mini_map_size[1] / len(self.tiles_map),
-                                        self.visible_area_size[0] * self.mini_map_size[0] / len(self.tiles_map),
-                                        self.visible_area_size[1] * self.mini_map_size[1] / len(self.tiles_map))
+        scale_x = self.mini_map_size[0] / area_size
+        scale_y = self.mini_map_size[1] / area_size
+        visible_area_rect = pygame.Rect((area_size - self.visible_area_size[0]) / 2 * scale_x,
+                                        (area_size - self.visible_area_size[1]) / 2 * scale_y,
+                                        self.visible_area_size[0] * scale_x,
+                                        self.visible_area_size[1] * scale_y)
         pygame.draw.rect(mini_map_surface, (255, 0, 0), visible_area_rect, 2)
 
-        self.display_surface.blit(mini_map_surface, (0, 0))
\ No newline at end of file
+        self.display_surface.blit(mini_map_surface, (0, 0))
@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+from perlin_noise import PerlinNoise
+from perlin_noise.tools import hasher, sample_vector
+
+
+class ChunkNoise:
+    """Batched version of ``PerlinNoise`` computing a whole block of the heightmap at once.
+
+    The values are bit-for-bit identical to calling ``PerlinNoise([x / scale, y / scale])`` for every tile:
+    the per-axis terms (distances and fades) are computed with the same float operations as the library,
+    and only the final products and sums are done on NumPy arrays, in the same order.
+    """
+
+    def __init__(self, octaves, seed, scale):
+        # Let PerlinNoise resolve the seed so that a falsy seed picks a random one exactly as before
+        self.seed = PerlinNoise(octaves=octaves, seed=seed).seed
+        self.octaves = octaves
+        self.scale = scale
+        self.gradients = {}  # Lattice coordinates -> gradient vector
+
+    def get_gradient(self, lattice_x, lattice_y):
+        gradient = self.gradients.get((lattice_x, lattice_y))
+        if gradient is None:
+            gradient = sample_vector(dimensions=2, seed=self.seed * hasher((lattice_x, lattice_y)))
+            self.gradients[(lattice_x, lattice_y)] = gradient
+        return gradient
+
+    def axis_terms(self, start, length):
+        """Lattice cells, distances and fades along one axis (see ``perlin_noise.RandVec.weight_to``)."""
+        cells = np.empty(length, dtype=np.int64)
+        distances = np.empty((2, length), dtype=np.float64)
+        fades = np.empty((2, length), dtype=np.float64)
+        for index in range(length):
+            coordinate = (start + index) / self.scale * self.octaves
+            cell = math.floor(coordinate)
+            cells[index] = cell
+            for corner in range(2):
+                distance = coordinate - (cell + corner)
+                value = 1 - abs(distance)
+                distances[corner, index] = distance
+                fades[corner, index] = 6 * math.pow(value, 5) - 15 * math.pow(value, 4) + 10 * math.pow(value, 3)
+        return cells, distances, fades
+
+    def get_heightmap(self, x, y, width, height):
+        """Noise values of the ``width`` x ``height`` tiles starting at (x, y), indexed as [row, column]."""
+        cells_x, distances_x, fades_x = self.axis_terms(x, width)
+        cells_y, distances_y, fades_y = self.axis_terms(y, height)
+
+        # Gradient table covering every lattice corner touched by the block
+        first_x, first_y = int(cells_x[0]), int(cells_y[0])
+        lattice_width = int(cells_x[-1]) - first_x + 2
+        lattice_height = int(cells_y[-1]) - first_y + 2
+        gradients = np.empty((2, lattice_height, lattice_width), dtype=np.float64)
+        for lattice_y in range(lattice_height):
+            for lattice_x in range(lattice_width):
+                gradients[:, lattice_y, lattice_x] = self.get_gradient(first_x + lattice_x, first_y + lattice_y)
+
+        columns = cells_x - first_x
+        rows = cells_y - first_y
+
+        # Same corner order as itertools.product in PerlinNoise.noise: (0, 0), (0, 1), (1, 0), (1, 1)
+        heightmap = None
+        for corner_x in range(2):
+            for corner_y in range(2):
+                corner_gradients = gradients[:, rows[:, None] + corner_y, columns[None, :] + corner_x]
+                weight = fades_x[corner_x][None, :] * fades_y[corner_y][:, None]
+                dot = (corner_gradients[0] * distances_x[corner_x][None, :]
+                       + corner_gradients[1] * distances_y[corner_y][:, None])
+                value = weight * dot
+                heightmap = value if heightmap is None else heightmap + value
+        return heightmap
@@ -1,12 +1,16 @@
-import random
-
-from perlin_noise import PerlinNoise
+import numpy as np
 from pygame import Vector2
 
 from src.config.game_data import GameData
+from src.map.noise import ChunkNoise
+from src.utils.random_streams import RandomStreams
 
 config = GameData()
 
+EMPTY_TILE = 255  # Tile id of the cells that hold no tile
+LOADING_TILE = 254  # Tile id of the cells whose chunk is still being generated
+SOLID_TILES = (0, 2)  # Tile ids the entities can't walk through
+
 
 class Tile:
     def __init__(self, tile_id, x, y, variant=1):
@@ -15,52 +19,180 @@ class Tile:
         self.pos = Vector2(x, y)
 
 
+class TileMap:
+    """Rectangular area of tiles stored as contiguous uint8 arrays of tile ids and variants.
+
+    The arrays are indexed as [row, column], (x, y) being stored at [y - origin_y, x - origin_x],
+    so the map can start at negative coordinates.
+    """
+
+    def __init__(self, origin_x, origin_y, width, height):
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.width = width
+        self.height = height
+        self.tile_ids = np.full((height, width), EMPTY_TILE, dtype=np.uint8)
+        self.variants = np.ones((height, width), dtype=np.uint8)
+        self.version = 0  # Incremented on every tile change
+
+    def __len__(self):
+        return int(np.count_nonzero(self.tile_ids != EMPTY_TILE))
+
+    def __contains__(self, pos):
+        return self.get(*pos) is not None
+
+    def __getitem__(self, pos):
+        """Compatibility accessor returning a ``Tile``, as the former dict of tiles did."""
+        x, y = int(pos[0]), int(pos[1])
+        tile_id = self.get(x, y)
+        if tile_id is None:
+            raise KeyError(pos)
+        return Tile(tile_id, x, y, int(self.variants[y - self.origin_y, x - self.origin_x]))
+
+    def items(self):
+        """Compatibility iterator over ((x, y), Tile) pairs, as the former dict of tiles did."""
+        for row, column in np.argwhere(self.tile_ids != EMPTY_TILE):
+            x, y = int(column) + self.origin_x, int(row) + self.origin_y
+            yield (x, y), Tile(int(self.tile_ids[row, column]), x, y, int(self.variants[row, column]))
+
+    def get(self, x, y):
+        """Returns the tile id at (x, y), or None if there is no tile."""
+        column, row = int(x) - self.origin_x, int(y) - self.origin_y
+        if 0 <= column < self.width and 0 <= row < self.height:
+            tile_id = int(self.tile_ids[row, column])
+            if tile_id != EMPTY_TILE:
+                return tile_id
+        return None
+
+    def set(self, x, y, tile_id, variant=1):
+        column, row = int(x) - self.origin_x, int(y) - self.origin_y
+        if not (0 <= column < self.width and 0 <= row < self.height):
+            raise KeyError((x, y))
+        self.tile_ids[row, column] = tile_id
+        self.variants[row, column] = variant
+        self.version += 1
+
+    def get_version(self, x, y):
+        """Returns a number that changes whenever a tile of the map changes."""
+        return self.version
+
+    def get_region(self, x, y, w, h):
+        """Returns the tile ids and variants of the w x h area starting at (x, y).
+
+        These are views on the map arrays when the area lies inside the map, otherwise copies
+        where the cells out of the map are EMPTY_TILE.
+        """
+        column, row = x - self.origin_x, y - self.origin_y
+        if 0 <= column and column + w <= self.width and 0 <= row and row + h <= self.height:
+            return self.tile_ids[row:row + h, column:column + w], self.variants[row:row + h, column:column + w]
+
+        tile_ids = np.full((h, w), EMPTY_TILE, dtype=np.uint8)
+        variants = np.ones((h, w), dtype=np.uint8)
+        start_column, end_column = max(column, 0), min(column + w, self.width)
+        start_row, end_row = max(row, 0), min(row + h, self.height)
+        if start_column < end_column and start_row < end_row:
+            target = (slice(start_row - row, end_row - row), slice(start_column - column, end_column - column))
+            tile_ids[target] = self.tile_ids[start_row:end_row, start_column:end_column]
+            variants[target] = self.variants[start_row:end_row, start_column:end_column]
+        return tile_ids, variants
+
+    def get_positions(self, tile_id, x=None, y=None, w=None, h=None):
+        """Returns the (x, y) positions of every tile with the given id, in the whole map or in the given area."""
+        if x is None:
+            x, y, w, h = self.origin_x, self.origin_y, self.width, self.height
+        tile_ids, _ = self.get_region(x, y, w, h)
+        return [(int(column) + x, int(row) + y) for row, column in np.argwhere(tile_ids == tile_id)]
+
+
 class NoiseTileMapGenerator:
     def __init__(self, game):
         self.game = game
         self.config = GameData()
-        self.tiles_map = {}
+        self.tiles_map = TileMap(0, 0, 0, 0)
+
+        self.noise = ChunkNoise(octaves=self.config.noise_map_octaves,
+                                seed=self.config.noise_map_seed,
+                                scale=self.config.noise_map_scale)
+        self.variants_seed = RandomStreams.get("tile_variants").getrandbits(64)
 
-        self.noise = PerlinNoise(octaves=self.config.noise_map_octaves, seed=self.config.noise_map_seed)
+    def __getstate__(self):
+        # Only the generation state is sent to the chunk generation processes
+        state = self.__dict__.copy()
+        state["game"] = None
+        state["tiles_map"] = None
+        return state
 
-    def generate_tile(self, x, y):
-        noise_value = self.noise([x / self.config.noise_map_scale, y / self.config.noise_map_scale])
-        if noise_value > self.config.noise_map_floor:
-            tile = Tile(1, x, y, int(random.randint(1, 3)))
-        else:
-            tile = Tile(2, x, y)
-        return tile
+    def generate_tiles(self, x, y, w, h, variants_rng):
+        """Returns the tile ids and variants of the w x h block starting at (x, y), indexed as [row, column]."""
+        heightmap = self.noise.get_heightmap(x, y, w, h)
+        floor = heightmap > self.config.noise_map_floor
+        tile_ids = np.where(floor, 1, 2).astype(np.uint8)
+        variants = np.where(floor, variants_rng.integers(1, 4, size=(h, w)), 1).astype(np.uint8)
+        return tile_ids, variants
+
+    @staticmethod
+    def apply_borders(tile_ids, variants, x, y, bounds):
+        """Surrounds the area (start_x, start_y, end_x, end_y) with walls and empties everything outside of it."""
+        start_x, start_y, end_x, end_y = bounds
+        h, w = tile_ids.shape
+        xs = np.arange(x, x + w)[None, :]
+        ys = np.arange(y, y + h)[:, None]
+        inside = (start_x <= xs) & (xs < end_x) & (start_y <= ys) & (ys < end_y)
+        border = inside & ((xs == start_x) | (xs == end_x - 1) | (ys == start_y) | (ys == end_y - 1))
+        tile_ids[border] = 0
+        tile_ids[~inside] = EMPTY_TILE
+        variants[tile_ids != 1] = 1
+
+    def get_world_bounds(self):
+        """Returns the (start_x, start_y, end_x, end_y) tiles of a finite world, centered on (0, 0)."""
+        start, end = int(-self.config.map_size / 2), int(self.config.map_size / 2)
+        return start, start, end, end
+
+    def generate_chunk(self, chunk_x, chunk_y):
+        """Generates the chunk (chunk_x, chunk_y) of the world, the same way whatever the generation order."""
+        chunk_size = self.config.chunk_size
+        chunk = TileMap(chunk_x * chunk_size, chunk_y * chunk_size, chunk_size, chunk_size)
+        variants_rng = np.random.default_rng([self.variants_seed, chunk_x & 0xFFFFFFFF, chunk_y & 0xFFFFFFFF])
+        chunk.tile_ids, chunk.variants = self.generate_tiles(chunk.origin_x, chunk.origin_y,
+                                                             chunk_size, chunk_size, variants_rng)
+        if not self.config.infinite_world:
+            self.apply_borders(chunk.tile_ids, chunk.variants, chunk.origin_x, chunk.origin_y,
+                               self.get_world_bounds())
+        return chunk
 
     def generate_tiles_map(self, origin_x, origin_y, w, h, wall_tiles_id=None, floor_tiles_id=None):
         if floor_tiles_id is None:
             floor_tiles_id = []
         if wall_tiles_id is None:
             wall_tiles_id = []
-        self.tiles_map = {}
-        if not self.tiles_map:
-            for y in range(int(origin_y - h / 2), int(origin_y + h / 2)):
-                for x in range(int(origin_x - w / 2), int(origin_x + w / 2)):
-                    if x == int(origin_x - w / 2) or x == int(origin_x + w / 2) - 1 or y == int(
-                            origin_y - h / 2) or y == int(origin_y + h / 2) - 1:
-                        tile = Tile(0, x, y)
-                    else:
-                        tile = self.generate_tile(x, y)
-                    self.tiles_map[(x, y)] = tile
+        start_x, end_x = int(origin_x - w / 2), int(origin_x + w / 2)
+        start_y, end_y = int(origin_y - h / 2), int(origin_y + h / 2)
+        chunk_size = self.config.chunk_size
+        variants_rng = np.random.default_rng(self.variants_seed)
+
+        self.tiles_map = TileMap(start_x, start_y, end_x - start_x, end_y - start_y)
+        for chunk_y in range(start_y, end_y, chunk_size):
+            for chunk_x in range(start_x, end_x, chunk_size):
+                chunk_w = min(chunk_size, end_x - chunk_x)
+                chunk_h = min(chunk_size, end_y - chunk_y)
+                tile_ids, variants = self.generate_tiles(chunk_x, chunk_y, chunk_w, chunk_h, variants_rng)
+                self.apply_borders(tile_ids, variants, chunk_x, chunk_y, (start_x, start_y, end_x, end_y))
+
+                row, column = chunk_y - start_y, chunk_x - start_x
+                self.tiles_map.tile_ids[row:row + chunk_h, column:column + chunk_w] = tile_ids
+                self.tiles_map.variants[row:row + chunk_h, column:column + chunk_w] = variants
 
         return self.tiles_map
 
     def get_visible_tiles(self):
+        """Returns the position of the top left visible tile and the tile ids of the visible area."""
         player_tile_pos = self.get_tile_position(self.game.player.pos)
         visible_tiles_x = self.config.window_width // self.config.tile_size + 2
         visible_tiles_y = self.config.window_height // self.config.tile_size + 3
         start_x = int(player_tile_pos.x - visible_tiles_x / 2)
         start_y = int(player_tile_pos.y - visible_tiles_y / 2)
-        visible_tiles = []
-        for y in range(start_y, start_y + visible_tiles_y):
-            for x in range(start_x, start_x + visible_tiles_x):
-                if (x, y) in self.tiles_map:
-                    visible_tiles.append(self.tiles_map[(x, y)])
-        return visible_tiles
+        tile_ids, _ = self.tiles_map.get_region(start_x, start_y, visible_tiles_x, visible_tiles_y)
+        return start_x, start_y, tile_ids
 
     def get_tile_position(self, pixel_position):
         tile_x = pixel_position[0] // self.config.tile_size
@@ -2,9 +2,13 @@ import pygame
 from pygame import Vector2, SRCALPHA, Surface
 
 from src.utils.colors import Color
+from src.utils.profiler import FrameProfiler
 
 
 class HealthBar:
+    # Surfaces shared by every health bar, the fill width being quantized to whole pixels
+    _surfaces = {}  # (fill width, width, height) -> Surface
+
     def __init__(self, alive_entity, width, height, offset=(0, 0)):
         self.display_surface = pygame.display.get_surface()
         self.entity = alive_entity
@@ -12,15 +16,31 @@ class HealthBar:
         self.width = width
         self.height = height
 
-    def get_surface(self):
-        surface = Surface((self.width, self.height), SRCALPHA)
-
+    def get_fill_width(self):
         if self.entity.max_health > 0:
             health_percentage = self.entity.health / self.entity.max_health
         else:
             health_percentage = 0
+        # Health out of [0, max_health] would draw past the bar, and add a surface per value to the cache
+        return max(0, min(self.width, int(self.width * health_percentage)))
 
-        pygame.draw.rect(surface, Color.LIGHT_GRAY, (0, 0, self.width, self.height), border_radius=int(self.height/2))
-        pygame.draw.rect(surface, Color.DARK_GREEN, (0, 0, self.width * health_percentage, self.height), border_radius=int(self.height/2))
+    def get_surface(self):
+        """Returns the health bar surface, rendered only once per fill width and size."""
+        key = (self.get_fill_width(), self.width, self.height)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self.render(*key)
+            self._surfaces[key] = surface
+        return surface
 
+    @staticmethod
+    def render(fill_width, width, height):
+        FrameProfiler.count("surfaces")
+        surface = Surface((width, height), SRCALPHA)
+        pygame.draw.rect(surface, Color.LIGHT_GRAY, (0, 0, width, height), border_radius=int(height/2))
+        pygame.draw.rect(surface, Color.DARK_GREEN, (0, 0, fill_width, height), border_radius=int(height/2))
         return surface
+
+    @classmethod
+    def clear(cls):
+        cls._surfaces.clear()
@@ -0,0 +1,31 @@
+from pygame import SRCALPHA, Surface
+
+from src.utils.profiler import FrameProfiler
+from src.utils.utils import draw_formatted_message, format_text
+
+
+class Nameplate:
+    def __init__(self, entity):
+        self.entity = entity
+        self.key = None  # (name, font) the surface was rendered with
+        self.surface = None
+        self.text_size = (0, 0)  # Size the name is centered with
+
+    def get_surface(self, font):
+        """Returns the surface of the formatted name, rendered again only when the name or the font changes."""
+        key = (self.entity.name, font)
+        if key != self.key:
+            self.render(font)
+            self.key = key
+        return self.surface
+
+    def render(self, font):
+        FrameProfiler.count("surfaces")
+        formatted_message = format_text(self.entity.name)
+        text_rects = [font.get_rect(text) for text, _ in formatted_message]
+        self.text_size = (sum(rect.width for rect in text_rects), sum(rect.height for rect in text_rects))
+        self.surface = Surface((self.text_size[0], max((rect.height for rect in text_rects), default=0)), SRCALPHA)
+        draw_formatted_message(font, self.surface, formatted_message, (0, 0))
+
+    def clear(self):
+        self.key = None
@@ -1,7 +1,16 @@
 import pygame
+import pygame.freetype
 
 from src.config.game_data import GameData
 from src.utils.colors import Color
+from src.utils.glyph_atlas import GlyphAtlas
+from src.utils.profiler import FrameProfiler
+
+# Sections of the profiler, in the order they run in a frame
+PROFILER_SECTIONS = ("events", "entity update", "tile collision", "entity collision", "map draw", "sprite draw",
+                     "UI draw")
+GRAPH_HEIGHT = 64
+FRAME_BUDGET = 1 / 60  # Frame time drawn at mid height of the graph ( in s )
 
 
 class Overlay:
@@ -11,16 +20,18 @@ class Overlay:
         self.game = game
         self.clock = self.game.clock
 
-        self.f3_font = pygame.font.Font("assets/fonts/Bubble.ttf", 12)
+        self.f3_font = pygame.freetype.Font("assets/fonts/Bubble.ttf", 12)
         self.texts = []
-        self.previous_texts = None
-        self.text_surfaces = []
-        self.text_rects = []
+
+        self.graph_surface = pygame.Surface((FrameProfiler.history_size, GRAPH_HEIGHT))
+        self.graph_frame_count = 0  # Frames drawn on the graph
+        self.profiler_texts = []
+        self.profiler_frame_count = 0  # Frames since the profiler texts were made
 
     def update_texts(self):
         player_pixel_pos = self.game.level.player.pos
         player_tile_pos = self.game.level.tile_map_generator.get_tile_position(self.game.level.player.pos)
-        new_texts = [
+        self.texts = [
             f'Player Pixel Position: ({int(player_pixel_pos.x)}, {int(player_pixel_pos.y)})',
             f'Player Tile Position: ({int(player_tile_pos.x)}, {int(player_tile_pos.y)})',
             f'FPS: {int(self.clock.get_fps())}',
@@ -29,14 +40,57 @@ class Overlay:
             f'Entities number: {len(self.game.level.entity_manager.enemies)+1}',
         ]
 
-        if new_texts != self.previous_texts:
-            self.texts = new_texts
-            self.previous_texts = new_texts
-            self.text_surfaces = [self.f3_font.render(text, True, Color.WHITE) for text in self.texts]
-            self.text_rects = [text_surf.get_rect(topleft=(10, 10 + i * 12)) for i, text_surf in enumerate(self.text_surfaces)]
+    def update_graph(self):
+        """Scrolls the frame time graph by one column for each frame measured since the last draw."""
+        if FrameProfiler.frame_count < self.graph_frame_count:  # The profiler was cleared
+            self.graph_surface.fill(Color.BLACK)
+            self.graph_frame_count = 0
+        new_frames = min(FrameProfiler.frame_count - self.graph_frame_count, len(FrameProfiler.frames))
+        self.graph_frame_count = FrameProfiler.frame_count
+        if not new_frames:
+            return
+        width = self.graph_surface.get_width()
+        self.graph_surface.scroll(-new_frames, 0)
+        self.graph_surface.fill(Color.BLACK, (width - new_frames, 0, new_frames, GRAPH_HEIGHT))
+        for index in range(new_frames):
+            frame_time = FrameProfiler.frames[index - new_frames][0]
+            height = min(GRAPH_HEIGHT, int(frame_time / FRAME_BUDGET * GRAPH_HEIGHT / 2))
+            color = Color.LIGHT_GREEN if frame_time <= FRAME_BUDGET else Color.LIGHT_RED
+            x = width - new_frames + index
+            pygame.draw.line(self.graph_surface, color, (x, GRAPH_HEIGHT - 1), (x, GRAPH_HEIGHT - height))
+        pygame.draw.line(self.graph_surface, Color.WHITE, (0, GRAPH_HEIGHT // 2), (width, GRAPH_HEIGHT // 2))
+
+    def update_profiler_texts(self):
+        """Makes the mean timings texts again every profiler_refresh_frames frames, so that they can be read."""
+        self.profiler_frame_count += 1
+        if self.profiler_texts and self.profiler_frame_count < self.config.profiler_refresh_frames:
+            return
+        self.profiler_frame_count = 0
+        frame_time, sections, counters = FrameProfiler.get_averages()
+        texts = [f'Frame: {frame_time * 1000:.2f} ms ({1 / frame_time if frame_time else 0:.0f} FPS)']
+        texts += [f'{name}: {sections.get(name, 0) * 1000:.2f} ms' for name in PROFILER_SECTIONS]
+        texts.append(f'Blits: {counters.get("blits", 0):.0f} / frame')
+        texts.append(f'Surfaces: {counters.get("surfaces", 0):.1f} / frame')
+        self.profiler_texts = texts
+
+    def draw_profiler(self):
+        self.update_graph()
+        self.update_profiler_texts()
+        dirty_rects = [self.display_surface.blit(self.graph_surface, (10, 10))]
+        FrameProfiler.count("blits")
+        atlas = GlyphAtlas.get(self.f3_font, Color.WHITE)
+        for i, text in enumerate(self.profiler_texts):
+            dirty_rects.append(atlas.render_to(self.display_surface, (10, 20 + GRAPH_HEIGHT + i * 12), text))
+        return dirty_rects
 
     def draw(self):
+        """Draws the debug texts and returns the rects drawn."""
+        dirty_rects = []
         if self.config.debug_level == 1 or self.config.debug_level == 4:
             self.update_texts()
-            for text_surf, text_rect in zip(self.text_surfaces, self.text_rects):
-                self.display_surface.blit(text_surf, text_rect)
\ No newline at end of file
+            atlas = GlyphAtlas.get(self.f3_font, Color.WHITE)
+            for i, text in enumerate(self.texts):
+                dirty_rects.append(atlas.render_to(self.display_surface, (10, 10 + i * 12), text))
+        elif self.config.debug_level == 5:
+            dirty_rects += self.draw_profiler()
+        return dirty_rects
\ No newline at end of file
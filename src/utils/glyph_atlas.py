@@ -0,0 +1,100 @@
+from pygame import BLEND_RGBA_MAX, SRCALPHA, Rect, Surface
+
+from src.utils.profiler import FrameProfiler
+
+ATLAS_WIDTH = 512
+TEXT_RECT_CACHE_SIZE = 4096  # (font path, size, text) whose rect is kept
+
+text_rects = {}  # (font path, size, text) -> rect of the text, as a tuple
+
+
+def get_text_rect(font, text):
+    """Rect of the text rendered with the font, as a tuple, kept for the font file and size it was measured with."""
+    key = (font.path, font.size, text)
+    rect = text_rects.get(key)
+    if rect is None:
+        if len(text_rects) >= TEXT_RECT_CACHE_SIZE:
+            del text_rects[next(iter(text_rects))]  # The oldest one
+        rect = tuple(font.get_rect(text))
+        text_rects[key] = rect
+    return rect
+
+
+class GlyphAtlas:
+    """Glyphs of a font in one color, rasterized once into a single surface and blitted to compose the texts.
+
+    The glyphs are placed as ``Font.render_to`` places them: one after the other by their advance (kerning is off,
+    as in the fonts of the game), the top of the tallest glyph being at the given position. Texts with characters
+    missing in the font are left to ``Font.render_to``, which draws its own placeholder for them.
+    """
+
+    atlases = {}  # (font path, size, color) -> GlyphAtlas
+
+    @classmethod
+    def get(cls, font, color):
+        key = (font.path, font.size, tuple(color))
+        atlas = cls.atlases.get(key)
+        if atlas is None:
+            atlas = cls(font, color)
+            cls.atlases[key] = atlas
+        return atlas
+
+    @classmethod
+    def clear(cls):
+        cls.atlases.clear()
+        text_rects.clear()
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.surface = Surface((ATLAS_WIDTH, font.get_sized_height()), SRCALPHA)
+        # Character -> (area in the surface, x offset, top above the baseline, advance), or None if the font lacks it
+        self.glyphs = {}
+        self.row_x = 0  # Where the next glyph goes in the last row of the surface
+        self.row_y = 0
+        self.row_height = 0
+
+    def add_glyph(self, character):
+        metrics = self.font.get_metrics(character)[0]
+        if metrics is None:  # Missing in the font
+            self.glyphs[character] = None
+            return None
+        glyph_surface, glyph_rect = self.font.render(character, self.color)
+        advance = metrics[4]
+        width, height = glyph_surface.get_size()
+
+        if self.row_x + width > ATLAS_WIDTH:
+            self.row_x, self.row_y, self.row_height = 0, self.row_y + self.row_height, 0
+        if self.row_y + height > self.surface.get_height():
+            surface = Surface((ATLAS_WIDTH, max(2 * self.surface.get_height(), self.row_y + height)), SRCALPHA)
+            surface.blit(self.surface, (0, 0), special_flags=BLEND_RGBA_MAX)
+            self.surface = surface
+
+        # Copies the pixels as they are, a blended blit would darken the antialiased edges
+        area = Rect(self.row_x, self.row_y, width, height)
+        self.surface.blit(glyph_surface, area, special_flags=BLEND_RGBA_MAX)
+        self.row_x += width
+        self.row_height = max(self.row_height, height)
+
+        glyph = (area, glyph_rect.x, glyph_rect.y, advance)
+        self.glyphs[character] = glyph
+        return glyph
+
+    def render_to(self, surface, pos, text):
+        """Draws the text like ``Font.render_to`` with a single batch of blits and returns the rect it covers."""
+        text_x, text_top, width, height = get_text_rect(self.font, text)
+        x, y = pos[0] - text_x, pos[1] + text_top
+        pen = 0
+        blits = []
+        for character in text:
+            glyph = self.glyphs[character] if character in self.glyphs else self.add_glyph(character)
+            if glyph is None:
+                FrameProfiler.count("blits")
+                return self.font.render_to(surface, pos, text, self.color)
+            area, offset_x, top, advance = glyph
+            if area.width:
+                blits.append((self.surface, (x + round(pen) + offset_x, y - top), area))
+            pen += advance
+        surface.blits(blits, False)
+        FrameProfiler.count("blits", len(blits))
+        return Rect(pos[0], pos[1], width, height)
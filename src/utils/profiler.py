@@ -0,0 +1,195 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter, defaultdict, deque
+from time import perf_counter, strftime
+
+
+class Section:
+    """Timed block of code, adding its duration to the section of the current frame."""
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        FrameProfiler.sections[self.name] += perf_counter() - self.start
+
+
+class NullSection:
+    """Section used while the profiler is disabled, doing nothing."""
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        pass
+
+
+NULL_SECTION = NullSection()
+
+
+class FrameProfiler:
+    """Time spent in each subsystem and counts of the work done (blits, surfaces created) over the last frames.
+
+    The subsystems run in ``with FrameProfiler.section(name)`` blocks and call ``count``, both of which do nothing
+    while the profiler is disabled, so the hooks can stay in the game loop.
+    """
+
+    enabled = False
+    history_size = 240  # Frames kept
+    sections = defaultdict(float)  # Section name -> time spent in the current frame ( in s )
+    counters = defaultdict(int)  # Counter name -> count in the current frame
+    frames = deque(maxlen=history_size)  # (frame time, sections, counters) of the last frames
+    frame_count = 0  # Frames measured since the last clear
+    frame_start = None
+    _sections = {}  # Section name -> Section
+
+    @classmethod
+    def section(cls, name):
+        if not cls.enabled:
+            return NULL_SECTION
+        section = cls._sections.get(name)
+        if section is None:
+            section = Section(name)
+            cls._sections[name] = section
+        return section
+
+    @classmethod
+    def count(cls, name, amount=1):
+        if cls.enabled:
+            cls.counters[name] += amount
+
+    @classmethod
+    def end_frame(cls):
+        """Stores the measures of the frame that ends and starts measuring the next one."""
+        if not cls.enabled:
+            cls.frame_start = None
+            return
+        now = perf_counter()
+        if cls.frame_start is not None:
+            cls.frames.append((now - cls.frame_start, dict(cls.sections), dict(cls.counters)))
+            cls.frame_count += 1
+        cls.sections.clear()
+        cls.counters.clear()
+        cls.frame_start = now
+
+    @classmethod
+    def get_averages(cls):
+        """Returns the mean frame time, and the mean time of each section and count of each counter per frame."""
+        if not cls.frames:
+            return 0, {}, {}
+        frame_count = len(cls.frames)
+        sections = defaultdict(float)
+        counters = defaultdict(int)
+        for _, frame_sections, frame_counters in cls.frames:
+            for name, elapsed in frame_sections.items():
+                sections[name] += elapsed
+            for name, count in frame_counters.items():
+                counters[name] += count
+        frame_time = sum(frame[0] for frame in cls.frames) / frame_count
+        return (frame_time, {name: elapsed / frame_count for name, elapsed in sections.items()},
+                {name: count / frame_count for name, count in counters.items()})
+
+    @classmethod
+    def clear(cls):
+        cls.sections.clear()
+        cls.counters.clear()
+        cls.frames.clear()
+        cls.frame_count = 0
+        cls.frame_start = None
+
+
+class StackSampler(threading.Thread):
+    """Thread sampling the call stack of another thread, counted as collapsed stacks for flame graphs."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()  # "outer;...;inner" -> samples
+        self.samples = 0
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pylint:disable=W0212
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+                self.samples += 1
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+class SessionProfiler:
+    """cProfile capture of a live session, started and stopped from the chat.
+
+    A stack sampler runs along cProfile so that a capture gives both a pstats file and a collapsed stacks file.
+    """
+
+    def __init__(self, sample_interval):
+        self.sample_interval = sample_interval
+        self.profile = None
+        self.sampler = None
+        self.running = False
+        self.frames = 0  # Frames in the capture
+        self.frames_left = None  # Frames before the capture stops by itself, or None
+        self.on_finish = None
+
+    def start(self, frames=None, on_finish=None):
+        """Starts a capture, stopped after the given number of frames (calling on_finish) or by ``stop``."""
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        self.frames = 0
+        self.frames_left = frames
+        self.on_finish = on_finish
+        self.running = True
+        self.sampler.start()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.sampler.stop()
+        self.running = False
+
+    def end_frame(self):
+        if not self.running:
+            return
+        self.frames += 1
+        if self.frames_left is None:
+            return
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.stop()
+            if self.on_finish is not None:
+                self.on_finish()
+
+    def dump(self, directory):
+        """Writes the last capture as pstats and collapsed stacks files and returns their paths and the samples."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, strftime("profile-%Y%m%d-%H%M%S"))
+        self.profile.dump_stats(path + ".pstats")
+        with open(path + ".collapsed", "w", encoding="utf-8") as file:
+            for stack, samples in self.sampler.stacks.most_common():
+                file.write(f"{stack} {samples}\n")
+        return path + ".pstats", path + ".collapsed", self.sampler.samples
+
+    def get_slowest(self, count):
+        """Returns the (name, calls, own time per frame) of the functions with the most own time in the last capture."""
+        stats = pstats.Stats(self.profile).stats
+        slowest = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:count]
+        frames = max(self.frames, 1)
+        return [(f"{function} ({os.path.basename(file)}:{line})", calls, total_time / frames)
+                for (file, line, function), (_, calls, total_time, _, _) in slowest]
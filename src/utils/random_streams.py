@@ -0,0 +1,29 @@
+import random
+
+from src.config.game_data import GameData
+
+
+class RandomStreams:
+    """Seeded random generators of the subsystems, so that a run can be played again identically.
+
+    Each subsystem draws from its own stream, so drawing more numbers in one of them does not change the others.
+    """
+
+    seed_names = {  # Stream name -> GameData attribute holding its seed
+        "entities": "entities_generator_seed",
+        "tile_variants": "tile_variants_seed",
+    }
+    _streams = {}  # Stream name -> random.Random
+
+    @classmethod
+    def get(cls, name):
+        stream = cls._streams.get(name)
+        if stream is None:
+            stream = random.Random(getattr(GameData(), cls.seed_names[name]))
+            cls._streams[name] = stream
+        return stream
+
+    @classmethod
+    def reset(cls):
+        """Restarts every stream from its seed."""
+        cls._streams.clear()
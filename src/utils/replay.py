@@ -0,0 +1,79 @@
+import json
+
+import pygame
+
+from src.entities.player import MOVEMENT_KEYS
+
+RECORDED_VALUE_TYPES = (bool, int, float, str, list, tuple)  # Event attributes that can be written to JSON
+
+
+def serialize_event(event):
+    attributes = {key: value for key, value in event.dict.items() if isinstance(value, RECORDED_VALUE_TYPES)}
+    return {"type": event.type, "attributes": attributes}
+
+
+def deserialize_event(data):
+    return pygame.event.Event(data["type"], data["attributes"])
+
+
+class RecordedKeys:
+    """State of the keys read back from a recording, indexed by key as ``pygame.key.get_pressed()``."""
+
+    def __init__(self, pressed_keys):
+        self.pressed_keys = set(pressed_keys)
+
+    def __getitem__(self, key):
+        return key in self.pressed_keys
+
+
+class InputRecorder:
+    """Writes the events handled and the movement keys read during every simulation tick to a JSON lines file."""
+
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+        self.events = []
+        self.pressed_keys = []
+
+    def record_event(self, event):
+        self.events.append(serialize_event(event))
+
+    def wrap_get_pressed(self, get_pressed):
+        """Returns get_pressed, remembering the movement keys it returns."""
+        def get_pressed_recorded():
+            keys = get_pressed()
+            self.pressed_keys = [key for key in MOVEMENT_KEYS if keys[key]]
+            return keys
+        return get_pressed_recorded
+
+    def end_tick(self, dt):
+        self.file.write(json.dumps({"dt": dt, "events": self.events, "keys": self.pressed_keys}) + "\n")
+        self.events = []
+        self.pressed_keys = []
+
+    def close(self):
+        self.file.close()
+
+
+class InputReplay:
+    """Plays a recording back on a new game, tick by tick, as fast as possible."""
+
+    def __init__(self, game, path):
+        self.game = game
+        with open(path, encoding="utf-8") as file:
+            self.ticks = [json.loads(line) for line in file]
+
+    def run(self, render=False):
+        """Simulates every recorded tick, drawing each of them if render is True, and returns the ticks played."""
+        played_ticks = 0
+        for tick in self.ticks:
+            if not self.game.running:
+                break
+            for data in tick["events"]:
+                self.game.handle_event(deserialize_event(data))
+            keys = RecordedKeys(tick["keys"])
+            self.game.level.player.get_pressed = lambda: keys
+            self.game.step(tick["dt"])
+            if render:
+                self.game.render()
+            played_ticks += 1
+        return played_ticks
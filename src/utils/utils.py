@@ -1,4 +1,6 @@
+import re
 from enum import Enum
+from functools import lru_cache
 from os import walk, path, makedirs
 from typing import List, Tuple
 from PIL import Image
@@ -7,6 +9,7 @@ import pygame
 from pygame import Vector2
 
 from src.utils.colors import colors
+from src.utils.glyph_atlas import GlyphAtlas, get_text_rect
 
 
 class Direction(Enum):
@@ -16,54 +19,53 @@ class Direction(Enum):
     RIGHT = Vector2(1, 0)
 
 
+COLOR_CODE = re.compile(r"&([0-9A-Fa-f&])")  # A color code, or && for a literal &
+FORMAT_CACHE_SIZE = 1024  # Lines whose parsed segments are kept
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def parse_color_codes(line: str) -> Tuple[Tuple[str, Tuple[int, int, int]], ...]:
+    """Cached segments of format_text, a tuple so that they can't be changed by the callers."""
+    segments = []
+    current_color = (255, 255, 255)  # Default color (white)
+    current_text = []
+    # The split alternates the text between the codes and the characters of the codes
+    parts = COLOR_CODE.split(line)
+    for index, part in enumerate(parts):
+        if index % 2 == 0 or part == "&":
+            current_text.append(part)
+            continue
+        if any(current_text):
+            segments.append(("".join(current_text), current_color))
+            current_text = []
+        current_color = colors[part.lower()]
+    if any(current_text):
+        segments.append(("".join(current_text), current_color))
+    return tuple(segments)
+
+
 def format_text(line: str) -> List[Tuple[str, Tuple[int, int, int]]]:
     """Format text with color codes.
 
+    ``&`` followed by a hexadecimal digit switches to the color of ``colors``, and ``&&`` shows a single ``&``.
+
     Args:
         line (str): The input text line.
 
     Returns:
         List[Tuple[str, Tuple[int, int, int]]]: A list of tuples containing formatted text and corresponding color tuples.
     """
-    formatted_lines = []  # List to store formatted text lines
-    current_color = (255, 255, 255)  # Default color (white)
-    current_text = ""  # Current text being processed
-    index = 0  # Index for iterating through the input line
-    line_length = len(line)  # Precompute the length of the input line
-
-    # TODO: Split this function into smaller pieces (and avoid bow shapes >-)
-    while index < line_length:
-        # TODO: Add an escape char (as does the \ most of programming languages)
-        # For example you can say that if there is two &, then the text isn't colored and only one is shown
-        if line[index] == "&" and index + 1 < line_length and line[index + 1] in "0123456789ABCDEFabcdef":
-            # Check if the character is a color code
-            color_char = line[index + 1]  # Extract color character
-            try:
-                color_index = int(color_char, 16)  # Convert color character to integer
-                if 0 <= color_index < len(colors):  # Check if color index is within range
-                    if current_text:
-                        formatted_lines.append((current_text, current_color))  # Append current text with its color
-                        current_text = ""  # Reset current text
-                    current_color = colors[color_char]  # Update current color
-                index += 2  # Move index forward by 2 to skip the color code
-            except ValueError:
-                current_text += line[index]  # Append character to current text
-                index += 1  # Move index forward by 1
-        else:
-            current_text += line[index]  # Append character to current text
-            index += 1  # Move index forward by 1
-
-    if current_text:
-        formatted_lines.append((current_text, current_color))  # Append remaining text with its color
-
-    return formatted_lines  # Return the list of formatted lines
+    return list(parse_color_codes(line))
 
 
 def draw_formatted_message(font, surface, formatted_message, pos):
+    """Draws the formatted message with the glyph atlases of the font and returns the rect it covers."""
     x, y = pos
+    drawn_rect = pygame.Rect(x, y, 0, 0)
     for text, color in formatted_message:
-        font.render_to(surface, (x, y), text, color)
-        x += font.get_rect(text)[2]
+        drawn_rect.union_ip(GlyphAtlas.get(font, color).render_to(surface, (x, y), text))
+        x += get_text_rect(font, text)[2]
+    return drawn_rect
 
 
 def import_folder(path):
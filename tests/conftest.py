@@ -0,0 +1,61 @@
+import os
+import sys
+from concurrent.futures import Future
+
+import pygame
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # The assets are loaded from paths relative to the root of the repository
+
+from src.config.game_data import GameData  # noqa: E402  pylint:disable=C0413
+from src.game import Game  # noqa: E402  pylint:disable=C0413
+
+
+@pytest.fixture
+def config():
+    """The GameData singleton, restored after the test as the benchmarks restore it."""
+    config = GameData()
+    saved_config = dict(vars(config))
+    saved_chat = dict(vars(config.Chat))
+    yield config
+    vars(config).clear()
+    vars(config).update(saved_config)
+    for name, value in saved_chat.items():
+        if not name.startswith("__"):
+            setattr(config.Chat, name, value)
+
+
+@pytest.fixture
+def game(config):
+    """A headless game generating its chunks on the main thread, so that the tests don't wait for a pool."""
+    config.chunk_workers = 0
+    pygame.init()
+    game = Game()
+    yield game
+    game.quit_game()
+    pygame.quit()
+
+
+@pytest.fixture
+def entity_manager(game):
+    return game.level.entity_manager
+
+
+class StalledPool:
+    """Chunk pool whose chunks never finish generating."""
+
+    @staticmethod
+    def submit(*_):
+        return Future()
+
+    def shutdown(self, **_):
+        pass
+
+
+@pytest.fixture
+def stalled_pool():
+    return StalledPool()
@@ -0,0 +1,30 @@
+import pygame
+import pytest
+from pygame import Vector2
+from pygame.sprite import Sprite
+
+from src.map.camera import Camera
+from src.entities.spatial_hash import SpatialHash
+
+
+@pytest.fixture
+def camera(config):
+    pygame.init()
+    pygame.display.set_mode((config.window_width, config.window_height))
+    yield Camera()
+    pygame.quit()
+
+
+@pytest.mark.parametrize("indexed", (False, True))
+def test_drawn_sprites_are_interpolated(camera, indexed):
+    sprite = Sprite(camera)
+    sprite.pos = Vector2(100, 100)
+    if indexed:
+        camera.spatial_index = SpatialHash(128)
+        camera.spatial_index.insert(sprite, pygame.Rect(100, 100, 1, 1))
+    camera.get_visible_sprites()  # Drawing a frame
+
+    camera.save_positions()
+    sprite.pos.update(110, 100)  # Simulation step
+    camera.interpolation = 0.5
+    assert camera.get_draw_pos(sprite) == Vector2(105, 100)
@@ -0,0 +1,35 @@
+import pytest
+
+
+def shown_ids(chat_ui):
+    return [message_id for message_id, _ in chat_ui.chat.get_messages(chat_ui.config.Chat.max_shown_messages)]
+
+
+def test_chat_surfaces_follow_the_messages(game, monkeypatch):
+    chat, chat_ui = game.chat, game.chat_ui
+    game.config.Chat.max_shown_messages = 3
+    game.config.Chat.max_messages = 5
+
+    def check():
+        chat_ui.update_chat_surfaces()
+        ids = shown_ids(chat_ui)
+        assert list(chat_ui.message_surfaces) == ids
+        assert chat_ui.chat_surfaces == [chat_ui.message_surfaces[message_id] for message_id in reversed(ids)]
+
+    for index in range(7):
+        chat.show_message(f"message {index}")
+        check()
+    chat.clear_last_message()
+    check()
+    chat.show_message("after the removal")
+    check()
+    game.config.Chat.max_shown_messages = 2
+    check()
+    chat.clear_all_messages()
+    check()
+    assert chat_ui.chat_surfaces == []
+
+    chat.show_message("last")
+    check()
+    monkeypatch.setattr(chat, "get_messages", lambda *args: pytest.fail("Messages listed while unchanged"))
+    chat_ui.update_chat_surfaces()
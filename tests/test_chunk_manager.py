@@ -0,0 +1,62 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from src.map.chunk_manager import ChunkManager
+from src.map.tile_map import NoiseTileMapGenerator
+
+
+def test_edits_survive_eviction(config):
+    config.chunk_workers = 0
+    config.chunk_cache_memory = 0  # Only the chunks seen by the camera are kept
+    chunk_manager = ChunkManager(NoiseTileMapGenerator(None))
+    chunk_manager.set(3, 4, 2, 1)
+    version = chunk_manager.get_version(3, 4)
+
+    # Load enough other chunks to evict the edited one
+    for chunk_x in range(1, chunk_manager.max_chunks + 2):
+        chunk_manager.get_chunk(chunk_x, 100, wait=True)
+    assert chunk_manager.get_version(3, 4) is None
+
+    chunk_manager.get_chunk(0, 0, wait=True)
+    assert chunk_manager.get(3, 4) == 2
+    assert chunk_manager.get_version(3, 4) > version
+    chunk_manager.close()
+
+
+def generate_chunks(chunk_manager, keys):
+    for chunk_x, chunk_y in keys:
+        chunk_manager.get_chunk(chunk_x, chunk_y)
+    return [chunk_manager.get_chunk(chunk_x, chunk_y, wait=True) for chunk_x, chunk_y in keys]
+
+
+def test_pooled_chunks_match_serial_chunks(config):
+    keys = [(chunk_x, chunk_y) for chunk_y in range(-2, 2) for chunk_x in range(-2, 2)]
+    generator = NoiseTileMapGenerator(None)
+    config.chunk_workers = 0
+    serial_chunks = generate_chunks(ChunkManager(generator), keys)
+    config.chunk_workers = 2
+    chunk_manager = ChunkManager(generator)
+    pooled_chunks = generate_chunks(chunk_manager, keys)
+    chunk_manager.close()
+
+    for pooled_chunk, serial_chunk in zip(pooled_chunks, serial_chunks):
+        assert np.array_equal(pooled_chunk.tile_ids, serial_chunk.tile_ids)
+        assert np.array_equal(pooled_chunk.variants, serial_chunk.variants)
+
+
+def test_failed_worker_falls_back_to_serial(config):
+    config.chunk_workers = 1
+    generator = NoiseTileMapGenerator(None)
+    chunk_manager = ChunkManager(generator)
+    future = Future()
+    future.set_exception(BrokenProcessPool("A worker died"))
+    chunk_manager.pending_chunks[(0, 0)] = future
+    chunk_manager.generated_chunks.put((0, 0))
+
+    chunk_manager.update()
+    assert chunk_manager.pool is None
+    assert np.array_equal(chunk_manager.chunks[(0, 0)].tile_ids, generator.generate_chunk(0, 0).tile_ids)
+    chunk_manager.get_chunk(1, 0)  # Generated on the main thread from now on
+    assert (1, 0) in chunk_manager.chunks
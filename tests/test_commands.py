@@ -0,0 +1,19 @@
+def last_message(game):
+    return game.chat.get_messages(1)[0][1]
+
+
+def test_summon_completes_the_spawnable_entities(game):
+    entity_manager = game.level.entity_manager
+    assert game.chat.commands.complete("/game summon ") == sorted(entity_manager.spawnable_entities)
+    assert game.chat.commands.complete("/game summon sl") == ["slime"]
+
+
+def test_summon_spawns_the_entity_by_name(game):
+    enemies = len(game.level.entity_manager.enemies)
+    game.chat.add_message("/game summon slime 10 -20")
+    assert last_message(game) == "Summoned slime at (10, -20)."
+    assert len(game.level.entity_manager.enemies) == enemies + 1
+
+    game.chat.add_message("/game summon dragon 10 -20")
+    assert last_message(game) == "Unknown entity dragon."
+    assert len(game.level.entity_manager.enemies) == enemies + 1
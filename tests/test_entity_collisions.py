@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from pygame import Vector2
+
+from src.bench.collisions import check_collisions_per_entity, place, spawn_crowd
+
+TOLERANCE = 16  # Mean distance allowed from where the pairs resolved one after another put the slimes ( in px )
+
+
+def resolve_both_ways(entity_manager, positions):
+    """Positions of the slimes after the per-entity resolution and after the collision stage, from positions."""
+    place(entity_manager, positions)
+    check_collisions_per_entity(entity_manager)
+    per_entity = [enemy.pos.copy() for enemy in entity_manager.enemies]
+    place(entity_manager, positions)
+    entity_manager.check_collisions()
+    return per_entity, [enemy.pos.copy() for enemy in entity_manager.enemies]
+
+
+def get_distances(positions, other_positions):
+    return np.array([(pos - other_pos).length() for pos, other_pos in zip(positions, other_positions)])
+
+
+def test_separate_pairs_are_resolved_as_before(entity_manager, config):
+    positions = spawn_crowd(entity_manager, 20, 1)
+    tile_size = config.tile_size
+    # Ten pairs of slimes overlapping by various amounts, each pair far from the others
+    positions = [Vector2(index // 2 * 4 * tile_size, 0) + index % 2 * Vector2(4 + index // 2 * 5, index % 3)
+                 for index in range(len(positions))]
+    per_entity, stage = resolve_both_ways(entity_manager, positions)
+    assert get_distances(per_entity, positions).min() > 0
+    assert get_distances(stage, per_entity) == pytest.approx(0, abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_crowd_is_resolved_close_to_before(entity_manager, config, seed):
+    positions = spawn_crowd(entity_manager, 300, 30, seed)
+    per_entity, stage = resolve_both_ways(entity_manager, positions)
+    assert get_distances(stage, per_entity).mean() <= TOLERANCE
+    # A slime moves at most by its largest overlap, never by the sum of them
+    assert get_distances(stage, positions).max() <= config.tile_size
+
+
+def test_dense_crowd_is_not_pushed_further(entity_manager, config):
+    positions = spawn_crowd(entity_manager, 1000, 20)
+    per_entity, stage = resolve_both_ways(entity_manager, positions)
+    assert get_distances(stage, positions).mean() <= get_distances(per_entity, positions).mean()
+    assert get_distances(stage, positions).max() <= config.tile_size
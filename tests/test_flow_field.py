@@ -0,0 +1,37 @@
+import numpy as np
+from pygame import Vector2
+
+from src.map.flow_field import FlowField
+
+RADIUS = 4
+
+
+def tile_center(config, tile_x, tile_y):
+    # The center of a tile is a whole tile away from its position
+    return Vector2((tile_x + 1) * config.tile_size, (tile_y + 1) * config.tile_size)
+
+
+def test_paths_through_negative_tiles(config):
+    flow_field = FlowField(None, RADIUS)
+    size = 2 * RADIUS + 1
+    walkable = np.ones((size, size), dtype=bool)
+    # Player at tile (0, 0), a wall on column 1 from row -3 to row 3 to walk around
+    walkable[1:size - 1, RADIUS + 1] = False
+    flow_field.compute(walkable, -RADIUS, -RADIUS)
+
+    direction = flow_field.get_direction(tile_center(config, -2, 0))
+    assert tuple(flow_field.next_tiles[RADIUS, RADIUS - 2]) == (-1, 0)
+    assert direction == Vector2(1, 0)
+
+    tiles = [(x, y) for y in range(-RADIUS, RADIUS + 1) for x in range(-RADIUS, RADIUS + 1) if (x, y) != (0, 0)]
+    positions = [tile_center(config, x, y) for x, y in tiles]
+    directions = flow_field.get_directions(np.array([(pos.x, pos.y) for pos in positions]))
+    for (x, y), pos, array_direction in zip(tiles, positions, directions):
+        direction = flow_field.get_direction(pos)
+        if not walkable[y + RADIUS, x + RADIUS]:
+            assert direction is None and np.isnan(array_direction).all()
+            continue
+        # Every walkable tile has a path, the ones behind the wall through negative rows
+        assert direction is not None
+        assert np.allclose(array_direction, (direction.x, direction.y))
+    assert flow_field.get_direction(tile_center(config, 2, 0)) == Vector2(0, -1)
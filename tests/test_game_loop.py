@@ -0,0 +1,37 @@
+import pytest
+
+
+class FrameClock:
+    """Clock whose frames all last the given time."""
+
+    def __init__(self, frame_time):
+        self.frame_time = frame_time
+
+    def tick(self, *_):
+        return self.frame_time
+
+
+def count_calls(monkeypatch, instance, name):
+    calls = []
+    function = getattr(instance, name)
+    monkeypatch.setattr(instance, name, lambda *args, **kwargs: calls.append(args) or function(*args, **kwargs))
+    return calls
+
+
+@pytest.mark.parametrize("pooled", (False, True))
+def test_chunks_load_once_per_frame(game, monkeypatch, stalled_pool, pooled):
+    tiles_map = game.level.tiles_map
+    if pooled:
+        tiles_map.pool = stalled_pool
+    steps = game.config.max_simulation_steps
+    # A frame long enough for every simulation step it may run
+    monkeypatch.setattr(game, "clock", FrameClock(steps * 1000 / game.config.simulation_rate))
+    drains = count_calls(monkeypatch, tiles_map, "update")
+    loads = count_calls(monkeypatch, tiles_map, "load_around")
+    ticks = count_calls(monkeypatch, game.level.entity_manager, "update")
+
+    game.update()
+    assert len(ticks) == steps
+    assert len(drains) == 1
+    # Without a pool, the chunks are generated at the ticks needing them, as a replay generates them
+    assert len(loads) == (1 if pooled else steps)
@@ -0,0 +1,39 @@
+import pygame
+import pygame.freetype
+import pytest
+
+from src.utils.glyph_atlas import GlyphAtlas, get_text_rect
+
+WHITE = (255, 255, 255)
+
+
+@pytest.fixture
+def font():
+    pygame.init()
+    GlyphAtlas.clear()
+    yield pygame.freetype.Font("assets/fonts/LycheeSoda.ttf", 20)
+    GlyphAtlas.clear()
+    pygame.quit()
+
+
+def draw_both_ways(font, text):
+    expected, drawn = pygame.Surface((300, 40), pygame.SRCALPHA), pygame.Surface((300, 40), pygame.SRCALPHA)
+    expected_rect = font.render_to(expected, (5, 5), text, WHITE)
+    drawn_rect = GlyphAtlas.get(font, WHITE).render_to(drawn, (5, 5), text)
+    return expected, drawn, expected_rect, drawn_rect
+
+
+@pytest.mark.parametrize("text", ["Slimey 42", "a€b", "€∑漢", "x漢y z", ""])
+def test_atlas_draws_like_the_font(font, text):
+    expected, drawn, expected_rect, drawn_rect = draw_both_ways(font, text)
+    assert pygame.image.tobytes(drawn, "RGBA") == pygame.image.tobytes(expected, "RGBA")
+    if text:
+        assert drawn_rect == expected_rect
+
+
+def test_text_rect_follows_the_font_size(font):
+    small_rect = get_text_rect(font, "Slimey")
+    font.size = 40
+    assert get_text_rect(font, "Slimey") == tuple(font.get_rect("Slimey")) != small_rect
+    expected, drawn, _, _ = draw_both_ways(font, "Slimey")
+    assert pygame.image.tobytes(drawn, "RGBA") == pygame.image.tobytes(expected, "RGBA")
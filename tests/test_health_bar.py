@@ -0,0 +1,11 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.overlays.health_bar import HealthBar
+
+
+@pytest.mark.parametrize("health, fill_width", [(-30, 0), (0, 0), (10, 25), (20, 50), (500, 50)])
+def test_fill_width_is_clamped(health, fill_width):
+    health_bar = HealthBar(SimpleNamespace(health=health, max_health=20), 50, 6)
+    assert health_bar.get_fill_width() == fill_width
@@ -0,0 +1,18 @@
+import time
+
+from src.utils.profiler import SessionProfiler
+
+
+def test_dump_reports_the_samples(tmp_path):
+    profiler = SessionProfiler(0.005)
+    profiler.start()
+    end = time.perf_counter() + 0.1
+    while time.perf_counter() < end:
+        pass
+    profiler.stop()
+
+    pstats_path, collapsed_path, samples = profiler.dump(tmp_path)
+    with open(collapsed_path, encoding="utf-8") as file:
+        written = sum(int(line.rsplit(" ", 1)[1]) for line in file)
+    assert samples == written > 0
+    assert pstats_path.endswith(".pstats")
@@ -0,0 +1,60 @@
+import pygame
+import pytest
+
+from src.game import Game
+from src.utils.replay import InputReplay, RecordedKeys
+
+FRAMES = 400
+TELEPORT_FRAME = 10
+TELEPORT_COMMAND = "/game tp 400 -300"  # Far from the loaded chunks, so that they are generated meanwhile
+
+
+def get_state(game):
+    entity_manager = game.level.entity_manager
+    return (tuple(game.level.player.pos), entity_manager.tick,
+            [tuple(enemy.pos) for enemy in entity_manager.enemies])
+
+
+def post_command(command):
+    """Posts the key events of opening the chat, typing the command and sending it."""
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_t, unicode="t"))
+    for character in command:
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=0, unicode=character))
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r"))
+
+
+@pytest.fixture
+def recording_path(config, tmp_path):
+    config.chunk_workers = 2  # The default, that recording turns off
+    config.input_recording_path = str(tmp_path / "input.jsonl")
+    return config.input_recording_path
+
+
+def test_replay_ends_in_the_recorded_state(config, recording_path):
+    pygame.init()
+    game = Game()
+    assert game.level.tiles_map.pool is None
+    keys = RecordedKeys([pygame.K_d])  # Walks right
+    game.level.player.get_pressed = game.input_recorder.wrap_get_pressed(lambda: keys)
+    for frame in range(FRAMES):
+        if frame == TELEPORT_FRAME:
+            post_command(TELEPORT_COMMAND)
+        game.handle_events()
+        game.update()
+        game.render()
+    recorded_state = get_state(game)
+    game.quit_game()
+    pygame.quit()
+
+    config.input_recording_path = None
+    config.chunk_workers = 0  # As python main.py --replay
+    pygame.init()
+    game = Game()
+    InputReplay(game, recording_path).run()
+    replayed_state = get_state(game)
+    game.quit_game()
+    pygame.quit()
+
+    assert recorded_state[1] > TELEPORT_FRAME
+    assert game.chat.get_messages()[-1][1].startswith("Teleported")
+    assert replayed_state == recorded_state
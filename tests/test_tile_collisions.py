@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from src.map.tile_map import EMPTY_TILE, LOADING_TILE
+
+WALKABLE_TILE = 1
+SLIME_COUNT = 400
+
+
+def build_layout(tiles_map, corner_x, corner_y, rng):
+    """Tiles around the corner shared by four chunks: 2 x 2 solid blocks across it, scattered solid tiles,
+    a column of empty tiles and a row of tiles still loading."""
+    for y in range(corner_y - 6, corner_y + 6):
+        for x in range(corner_x - 6, corner_x + 6):
+            tiles_map.set(x, y, rng.choice((0, 2)) if rng.random() < 0.2 else WALKABLE_TILE)
+    for x, y in ((corner_x - 1, corner_y - 1), (corner_x + 2, corner_y - 4)):
+        for dy in range(2):
+            for dx in range(2):
+                tiles_map.set(x + dx, y + dy, 0)
+    for y in range(corner_y - 6, corner_y + 6):
+        tiles_map.set(corner_x - 5, y, EMPTY_TILE)
+    for x in range(corner_x - 6, corner_x + 6):
+        tiles_map.set(x, corner_y + 4, LOADING_TILE)
+
+
+def get_positions(rng, corner_x, corner_y, tile_size):
+    """Seeded positions around the corner, some on whole and half tiles, where the overlaps are the tightest."""
+    positions = []
+    for index in range(SLIME_COUNT):
+        x = rng.uniform(corner_x - 6, corner_x + 6) * tile_size
+        y = rng.uniform(corner_y - 6, corner_y + 6) * tile_size
+        if index % 4 == 0:
+            x, y = round(x / (tile_size / 2)) * tile_size / 2, round(y / (tile_size / 2)) * tile_size / 2
+        positions.append((x, y))
+    return positions
+
+
+def resolve_both_ways(entity_manager, positions):
+    """Returns the positions the slimes end at with the scalar and with the batched tile collisions."""
+    while len(entity_manager.enemies) < len(positions):
+        entity_manager.spawn_entity("slime", (0, 0))
+    enemies = entity_manager.enemies[:len(positions)]
+    results = []
+    for check_tile_collisions in (lambda: [entity_manager.check_tile_collision(enemy) for enemy in enemies],
+                                  lambda: entity_manager.check_tile_collisions(enemies)):
+        for enemy, pos in zip(enemies, positions):
+            enemy.pos.update(pos)
+            enemy.collide_rect = enemy.get_collide_rect()
+        check_tile_collisions()
+        results.append([tuple(enemy.pos) for enemy in enemies])
+    return results
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batched_tile_collisions_match_scalar(entity_manager, config, seed):
+    rng = random.Random(seed)
+    tiles_map = entity_manager.tile_map_generator.tiles_map
+    corner_x = corner_y = 2 * config.chunk_size
+    build_layout(tiles_map, corner_x, corner_y, rng)
+
+    positions = get_positions(rng, corner_x, corner_y, config.tile_size)
+    scalar, batched = resolve_both_ways(entity_manager, positions)
+    assert scalar != positions  # Some slimes were pushed out of the tiles
+    assert batched == scalar
+
+
+def test_batched_tile_collisions_match_scalar_next_to_generating_chunk(entity_manager, config, stalled_pool):
+    rng = random.Random(0)
+    tiles_map = entity_manager.tile_map_generator.tiles_map
+    chunk_size = config.chunk_size
+    corner_x, corner_y = 11 * chunk_size, 10 * chunk_size + chunk_size // 2
+    for y in range(corner_y - 6, corner_y + 6):
+        for x in range(corner_x - 6, corner_x):
+            tiles_map.set(x, y, 0 if x >= corner_x - 2 else WALKABLE_TILE)
+    # Chunk (11, 10) is still being generated: the scalar path sees no tiles and the batched one LOADING_TILE
+    tiles_map.pool = stalled_pool
+
+    positions = [(rng.uniform(corner_x - 6, corner_x + 6) * config.tile_size,
+                  rng.uniform(corner_y - 6, corner_y + 6) * config.tile_size) for _ in range(SLIME_COUNT)]
+    scalar, batched = resolve_both_ways(entity_manager, positions)
+    assert (11, 10) not in tiles_map.chunks
+    tiles_map.pool = None
+    tiles_map.pending_chunks.clear()
+    assert scalar != positions
+    assert batched == scalar